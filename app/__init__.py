@@ -11,12 +11,33 @@ def create_app() -> Flask:
     db.init_app(app)
 
     from . import models  # noqa: F401
+    from .cli import register_cli
     from .routes import main_bp
+    from .services.invalidation_service import install_session_hooks
 
     app.register_blueprint(main_bp)
+    register_cli(app)
 
+    # Dans tout processus, commandes comprises: leurs écritures doivent aussi
+    # publier leurs invalidations au commit.
     with app.app_context():
-        db.create_all()
-        ensure_schema()
+        install_session_hooks()
 
     return app
+
+
+def start_serving(app: Flask) -> None:
+    """Prépare un processus qui sert des requêtes: schéma puis threads d'arrière-plan.
+
+    Appelé par gunicorn (hook `post_worker_init`, voir gunicorn.conf.py) et par
+    `python run.py`, jamais par les commandes `flask`: elles ne démarrent aucun
+    thread, et `db-upgrade` migre sans passer par la migration automatique.
+    """
+    with app.app_context():
+        ensure_schema(auto_upgrade=bool(app.config["SCHEMA_AUTO_UPGRADE"]))
+
+    from .services.invalidation_service import start_invalidation_listener
+    from .services.sheet_refresher import start_sheet_refresher
+
+    start_invalidation_listener(app)
+    start_sheet_refresher(app)
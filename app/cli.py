@@ -0,0 +1,274 @@
+"""Commandes `flask` d'administration."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import random
+import time
+
+import click
+from flask import Flask, current_app
+from sqlalchemy import text
+
+from .constants import (
+    DEFAULT_ENRICH_WORKERS,
+    DEFAULT_GAMES_PAGE_SIZE,
+    DEFAULT_MIRROR_SYNC_MAX_GAMES_PER_PLATFORM,
+    ENRICH_CHECKPOINT_NAME,
+    SHEET_BUILD_BATCH_SIZE,
+)
+from .igdb import rank_search_results
+from .extensions import db
+from .models import Game
+
+
+# Données synthétiques du micro-benchmark de classement.
+_BENCH_PLATFORMS = (
+    "PC (Microsoft Windows)",
+    "PlayStation 2",
+    "PlayStation 4",
+    "Xbox 360",
+    "Nintendo Switch",
+    "Super Nintendo Entertainment System",
+    "Sega Mega Drive/Genesis",
+    "Game Boy Advance",
+    "Nintendo DS",
+    "Wii U",
+    "Mac",
+    "Linux",
+)
+_BENCH_WORDS = ("super", "mario", "kart", "legend", "zelda", "of", "the", "world", "party", "64", "deluxe", "sonic")
+
+
+def _build_bench_results(count: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        {
+            "igdb_id": index + 1,
+            "title": " ".join(rng.choice(_BENCH_WORDS) for _ in range(rng.randint(1, 5))).title(),
+            "platforms": rng.sample(_BENCH_PLATFORMS, rng.randint(1, 6)),
+        }
+        for index in range(count)
+    ]
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _collection_queries() -> dict[str, object]:
+    """Requêtes des endpoints de collection vérifiées par `explain-check`."""
+    from .services.collection_service import (
+        GAME_SORTS,
+        collection_summary_query,
+        filter_games,
+        order_games,
+        platform_names_query,
+    )
+
+    def page(query, after=None, sort="az"):
+        return order_games(query, after, sort).limit(DEFAULT_GAMES_PAGE_SIZE + 1).statement
+
+    # Valeurs d'exemple: le plan ne dépend pas de leur présence en base.
+    platform = "Nintendo Switch"
+    queries = {
+        "/api/games": page(Game.query),
+        "/api/games?after": page(Game.query, after=("M", 0)),
+        "/api/games?platform": page(filter_games(Game.query, platform=platform)),
+        "/api/games?completed": page(filter_games(Game.query, completed=True)),
+        "/api/games?platform&completed": page(filter_games(Game.query, platform=platform, completed=False)),
+        "/api/games?q": page(filter_games(Game.query, title_search="zelda")),
+        "/api/platforms": platform_names_query().statement,
+        "/api/collection/summary": collection_summary_query().statement,
+    }
+    for sort in GAME_SORTS:
+        if sort != "az":
+            queries[f"/api/games?sort={sort}"] = page(Game.query, sort=sort)
+    return queries
+
+
+def _sequential_scans(connection, statement) -> list[str]:
+    """Tables parcourues intégralement par le plan de `statement`."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name != "postgresql":
+        # SQLite: « SCAN games » sans « USING ... INDEX » est un parcours complet.
+        details = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        return [detail.split()[1] for detail in details if detail.startswith("SCAN ") and "INDEX" not in detail]
+
+    # Sur une petite table, PostgreSQL préfère à raison le parcours séquentiel:
+    # le désactiver révèle s'il existe un index utilisable, quel que soit le volume.
+    with connection.begin():
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+
+    scans: list[str] = []
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Node Type") == "Seq Scan":
+            scans.append(node.get("Relation Name", "?"))
+        nodes.extend(node.get("Plans") or [])
+    return scans
+
+
+def _ensure_schema() -> None:
+    # Les commandes ne passent pas par `start_serving`: celles qui lisent ou
+    # écrivent la base vérifient le schéma elles-mêmes.
+    from .db_init import ensure_schema
+
+    ensure_schema(auto_upgrade=bool(current_app.config["SCHEMA_AUTO_UPGRADE"]))
+
+
+def register_cli(app: Flask) -> None:
+    @app.cli.command("db-upgrade")
+    def db_upgrade() -> None:
+        """Applique les migrations de schéma en attente."""
+        from .db_init import get_schema_version, upgrade_schema
+
+        for version, name in upgrade_schema():
+            click.echo(f"Migration {version} appliquée: {name}")
+        click.echo(f"Schéma à jour (version {get_schema_version()}).")
+
+    @app.cli.command("igdb-sync")
+    @click.option("--platform", "platforms", multiple=True, help="Plateforme à synchroniser (répétable). Par défaut: celles de la collection.")
+    @click.option(
+        "--max-games",
+        type=int,
+        default=DEFAULT_MIRROR_SYNC_MAX_GAMES_PER_PLATFORM,
+        show_default=True,
+        help="Nombre maximal de jeux IGDB par plateforme.",
+    )
+    def igdb_sync(platforms: tuple[str, ...], max_games: int) -> None:
+        """Remplit le miroir local du catalogue IGDB."""
+        from .services.igdb_mirror_service import sync_igdb_mirror
+
+        client_id = current_app.config.get("IGDB_CLIENT_ID", "")
+        client_secret = current_app.config.get("IGDB_CLIENT_SECRET", "")
+        if not client_id or not client_secret:
+            raise click.ClickException("IGDB_CLIENT_ID ou IGDB_CLIENT_SECRET manquant.")
+        _ensure_schema()
+
+        names = list(platforms) or [name for (name,) in db.session.query(Game.platform).distinct().order_by(Game.platform)]
+        total = sync_igdb_mirror(
+            client_id=client_id,
+            client_secret=client_secret,
+            platforms=names,
+            max_games_per_platform=max_games,
+            on_progress=lambda platform, count: click.echo(f"{platform}: {count} jeux"),
+        )
+        click.echo(f"Miroir IGDB: {total} jeux synchronisés.")
+
+    @app.cli.command("explain-check")
+    def explain_check() -> None:
+        """Échoue si une requête de collection n'a pas d'index utilisable (parcours séquentiel)."""
+        failures = []
+        with db.engine.connect() as connection:
+            for name, statement in _collection_queries().items():
+                scans = _sequential_scans(connection, statement)
+                click.echo(f"{name}: {'parcours séquentiel de ' + ', '.join(scans) if scans else 'index'}")
+                if scans:
+                    failures.append(name)
+        if failures:
+            raise click.ClickException(f"Requêtes sans index: {', '.join(failures)}")
+
+    @app.cli.command("bench-ranking")
+    @click.option("--results", "result_count", type=int, default=120, show_default=True, help="Résultats IGDB simulés par recherche.")
+    @click.option("--iterations", type=int, default=2000, show_default=True)
+    @click.option("--query", default="super mario kart", show_default=True)
+    @click.option("--platform", default="Nintendo Switch", show_default=True)
+    def bench_ranking(result_count: int, iterations: int, query: str, platform: str) -> None:
+        """Micro-benchmark: temps CPU du filtre plateforme + classement par recherche."""
+        results = _build_bench_results(result_count)
+
+        started = time.process_time()
+        rank_search_results(results, query, page_size=5, platform=platform)
+        first_call = time.process_time() - started
+
+        started = time.process_time()
+        for _ in range(iterations):
+            rank_search_results(results, query, page_size=5, platform=platform)
+        per_search = (time.process_time() - started) / max(iterations, 1)
+
+        click.echo(f"{result_count} résultats, plateforme {platform!r}, requête {query!r}")
+        click.echo(f"Premier appel: {first_call * 1e6:.0f} µs CPU")
+        click.echo(f"Par recherche: {per_search * 1e6:.0f} µs CPU (moyenne sur {iterations})")
+
+    @app.cli.command("enrich")
+    @click.option("--workers", type=int, default=DEFAULT_ENRICH_WORKERS, show_default=True, help="Lots traités en parallèle.")
+    @click.option("--batch-size", type=int, default=SHEET_BUILD_BATCH_SIZE, show_default=True, help="Jeux par lot.")
+    @click.option("--limit", type=int, default=0, help="Nombre maximal de jeux pour cette exécution (0: tous).")
+    @click.option("--restart", is_flag=True, help="Ignore le point de reprise et repart du début.")
+    def enrich(workers: int, batch_size: int, limit: int, restart: bool) -> None:
+        """Complète les jeux sans métadonnées ou sans fiche en cache, avec reprise."""
+        from .services.enrich_service import (
+            clear_checkpoint,
+            count_games_to_enrich,
+            find_games_to_enrich,
+            load_checkpoint,
+            run_enrich_batch,
+            save_checkpoint,
+        )
+
+        if not current_app.config.get("IGDB_CLIENT_ID") or not current_app.config.get("IGDB_CLIENT_SECRET"):
+            raise click.ClickException("IGDB_CLIENT_ID ou IGDB_CLIENT_SECRET manquant.")
+        _ensure_schema()
+
+        if restart:
+            clear_checkpoint(ENRICH_CHECKPOINT_NAME)
+        state = {"after_id": 0, "enriched": 0, "failed": 0, **load_checkpoint(ENRICH_CHECKPOINT_NAME)}
+        if state["after_id"]:
+            click.echo(f"Reprise après le jeu #{state['after_id']}.")
+
+        total = count_games_to_enrich(state["after_id"])
+        if limit > 0:
+            total = min(total, limit)
+        click.echo(f"{total} jeux à enrichir.")
+        if not total:
+            return
+
+        app_obj = current_app._get_current_object()
+        cursor = state["after_id"]
+        submitted = processed = 0
+        started = time.monotonic()
+        # Lots dans l'ordre de soumission: le point de reprise n'avance que
+        # lorsque tous les lots précédents sont terminés.
+        in_flight: deque = deque()
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="enrich") as pool:
+            while True:
+                while submitted < total and len(in_flight) < max(workers, 1) * 2:
+                    game_ids = find_games_to_enrich(cursor, min(batch_size, total - submitted))
+                    if not game_ids:
+                        total = submitted
+                        break
+                    cursor = game_ids[-1]
+                    submitted += len(game_ids)
+                    in_flight.append((game_ids, pool.submit(run_enrich_batch, app_obj, game_ids)))
+                if not in_flight:
+                    break
+
+                wait([future for _, future in in_flight], return_when=FIRST_COMPLETED)
+                while in_flight and in_flight[0][1].done():
+                    game_ids, future = in_flight.popleft()
+                    enriched = future.result()
+                    processed += len(game_ids)
+                    state["after_id"] = game_ids[-1]
+                    state["enriched"] += len(enriched)
+                    state["failed"] += len(game_ids) - len(enriched)
+                    save_checkpoint(ENRICH_CHECKPOINT_NAME, state)
+
+                    elapsed = time.monotonic() - started
+                    rate = processed / elapsed if elapsed else 0.0
+                    eta = _format_duration((total - processed) / rate) if rate else "?"
+                    click.echo(
+                        f"{processed}/{total} jeux ({len(enriched)}/{len(game_ids)} trouvés) "
+                        f"- {rate:.1f} jeux/s - reste {eta}"
+                    )
+
+        click.echo(f"Terminé: {state['enriched']} jeux enrichis, {state['failed']} sans correspondance IGDB.")
+        if not find_games_to_enrich(cursor, 1):
+            # Parcours complet: la prochaine exécution repart du début (et retente les échecs).
+            clear_checkpoint(ENRICH_CHECKPOINT_NAME)
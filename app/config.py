@@ -3,7 +3,23 @@ from __future__ import annotations
 import os
 from typing import Any
 
-from .constants import DEFAULT_SHEET_CACHE_TTL_SECONDS
+from .constants import (
+    DEFAULT_EVENT_STREAM_MAX_SUBSCRIBERS,
+    DEFAULT_HTTP_BACKOFF_SECONDS,
+    DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS,
+    DEFAULT_HTTP_MAX_RETRIES,
+    DEFAULT_HTTP_POOL_SIZE,
+    DEFAULT_IGDB_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_IGDB_REQUESTS_PER_SECOND,
+    DEFAULT_IGDB_TIMEOUT_SECONDS,
+    DEFAULT_SHEET_BUILDER_WORKERS,
+    DEFAULT_SHEET_CACHE_TTL_SECONDS,
+    DEFAULT_SHEET_REFRESH_AHEAD_SECONDS,
+    DEFAULT_SHEET_REFRESH_BATCH_SIZE,
+    DEFAULT_SHEET_REFRESH_INTERVAL_SECONDS,
+    DEFAULT_SHEET_REFRESH_MIN_DELAY_SECONDS,
+    DEFAULT_WIKIPEDIA_TIMEOUT_SECONDS,
+)
 
 
 DEFAULT_DATABASE_URL = "postgresql+psycopg2://games_user:games_password@db:5432/games_db"
@@ -19,6 +35,16 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_float(name: str, default: float) -> float:
+    value = (os.getenv(name) or "").strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def load_config() -> dict[str, Any]:
     return {
         "SQLALCHEMY_DATABASE_URI": os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL),
@@ -29,4 +55,44 @@ def load_config() -> dict[str, Any]:
             "SHEET_CACHE_TTL_SECONDS",
             DEFAULT_SHEET_CACHE_TTL_SECONDS,
         ),
+        "SHEET_BUILDER_WORKERS": _env_int(
+            "SHEET_BUILDER_WORKERS",
+            DEFAULT_SHEET_BUILDER_WORKERS,
+        ),
+        "SHEET_REFRESH_INTERVAL_SECONDS": _env_int(
+            "SHEET_REFRESH_INTERVAL_SECONDS",
+            DEFAULT_SHEET_REFRESH_INTERVAL_SECONDS,
+        ),
+        "SHEET_REFRESH_BATCH_SIZE": _env_int(
+            "SHEET_REFRESH_BATCH_SIZE",
+            DEFAULT_SHEET_REFRESH_BATCH_SIZE,
+        ),
+        "SHEET_REFRESH_AHEAD_SECONDS": _env_int(
+            "SHEET_REFRESH_AHEAD_SECONDS",
+            DEFAULT_SHEET_REFRESH_AHEAD_SECONDS,
+        ),
+        "SHEET_REFRESH_MIN_DELAY_SECONDS": _env_float(
+            "SHEET_REFRESH_MIN_DELAY_SECONDS",
+            DEFAULT_SHEET_REFRESH_MIN_DELAY_SECONDS,
+        ),
+        "HTTP_POOL_SIZE": _env_int("HTTP_POOL_SIZE", DEFAULT_HTTP_POOL_SIZE),
+        "HTTP_CONNECT_TIMEOUT_SECONDS": _env_float(
+            "HTTP_CONNECT_TIMEOUT_SECONDS",
+            DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        "IGDB_TIMEOUT_SECONDS": _env_float("IGDB_TIMEOUT_SECONDS", DEFAULT_IGDB_TIMEOUT_SECONDS),
+        "WIKIPEDIA_TIMEOUT_SECONDS": _env_float("WIKIPEDIA_TIMEOUT_SECONDS", DEFAULT_WIKIPEDIA_TIMEOUT_SECONDS),
+        "HTTP_MAX_RETRIES": _env_int("HTTP_MAX_RETRIES", DEFAULT_HTTP_MAX_RETRIES),
+        "HTTP_BACKOFF_SECONDS": _env_float("HTTP_BACKOFF_SECONDS", DEFAULT_HTTP_BACKOFF_SECONDS),
+        "IGDB_REQUESTS_PER_SECOND": _env_float("IGDB_REQUESTS_PER_SECOND", DEFAULT_IGDB_REQUESTS_PER_SECOND),
+        "IGDB_MAX_CONCURRENT_REQUESTS": _env_int(
+            "IGDB_MAX_CONCURRENT_REQUESTS",
+            DEFAULT_IGDB_MAX_CONCURRENT_REQUESTS,
+        ),
+        "EVENT_STREAM_MAX_SUBSCRIBERS": _env_int(
+            "EVENT_STREAM_MAX_SUBSCRIBERS",
+            DEFAULT_EVENT_STREAM_MAX_SUBSCRIBERS,
+        ),
+        # 0: les workers ne migrent pas, `flask db-upgrade` s'en charge au déploiement.
+        "SCHEMA_AUTO_UPGRADE": _env_int("SCHEMA_AUTO_UPGRADE", 1),
     }
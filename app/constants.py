@@ -2,3 +2,73 @@ DEFAULT_OWNERSHIP_TYPE = "unknown"
 VALID_OWNERSHIP_TYPES = {"physical", "digital", DEFAULT_OWNERSHIP_TYPE}
 
 DEFAULT_SHEET_CACHE_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_SHEET_BUILDER_WORKERS = 2
+# Attente courte: un thread gunicorn n'est retenu que quelques secondes, le client relance.
+MAX_SHEET_WAIT_SECONDS = 3
+SHEET_BUILD_BATCH_SIZE = 10
+
+DEFAULT_SHEET_REFRESH_INTERVAL_SECONDS = 5 * 60
+DEFAULT_SHEET_REFRESH_BATCH_SIZE = 20
+DEFAULT_SHEET_REFRESH_AHEAD_SECONDS = 60 * 60
+DEFAULT_SHEET_REFRESH_MIN_DELAY_SECONDS = 1.0
+SHEET_REFRESH_FAILURE_BACKOFF_SECONDS = 60 * 60
+# Identifiant arbitraire du verrou consultatif PostgreSQL du rafraîchisseur.
+SHEET_REFRESHER_LOCK_KEY = 724_001
+# Idem pour les migrations de schéma (un seul processus migre à la fois).
+SCHEMA_MIGRATION_LOCK_KEY = 724_002
+
+DEFAULT_GAMES_PAGE_SIZE = 200
+MAX_GAMES_PAGE_SIZE = 1000
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 200
+EXPORT_CHUNK_SIZE = 500
+
+BULK_MAX_IDS = 5000
+SHEETS_BATCH_MAX_IDS = 100
+
+# Threads gunicorn (voir Dockerfile).
+DEFAULT_GUNICORN_THREADS = 4
+# Recherches Wikipédia parallèles (variantes d'un titre, titres d'un lot).
+WIKIPEDIA_SEARCH_WORKERS = 6
+# Pool de connexions par hôte: tous les threads qui peuvent appeler le même hôte
+# en même temps (requêtes, constructeurs de fiches, recherches Wikipédia, plus
+# le rafraîchissement des recherches IGDB et celui des fiches).
+DEFAULT_HTTP_POOL_SIZE = DEFAULT_GUNICORN_THREADS + DEFAULT_SHEET_BUILDER_WORKERS + WIKIPEDIA_SEARCH_WORKERS + 2
+DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS = 3.0
+DEFAULT_IGDB_TIMEOUT_SECONDS = 10.0
+DEFAULT_WIKIPEDIA_TIMEOUT_SECONDS = 2.5
+DEFAULT_HTTP_MAX_RETRIES = 2
+DEFAULT_HTTP_BACKOFF_SECONDS = 0.3
+# Plafond d'un Retry-After: au-delà, mieux vaut échouer que bloquer un thread.
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+# Budget IGDB par processus (limite publique: 4 req/s, 8 requêtes simultanées).
+DEFAULT_IGDB_REQUESTS_PER_SECOND = 4.0
+DEFAULT_IGDB_MAX_CONCURRENT_REQUESTS = 8
+
+# Invalidation inter-workers (LISTEN/NOTIFY) et flux SSE des navigateurs.
+INVALIDATION_CHANNEL = "ludotheque_invalidation"
+# Un NOTIFY est limité à 8000 octets: les listes d'ids sont découpées.
+INVALIDATION_NOTIFY_MAX_IDS = 500
+INVALIDATION_LISTENER_RETRY_SECONDS = 5
+# Chaque flux SSE occupe un thread gunicorn: on les plafonne par processus, bien
+# en dessous du nombre de threads (les long-polls de fiches en ont aussi besoin).
+DEFAULT_EVENT_STREAM_MAX_SUBSCRIBERS = DEFAULT_GUNICORN_THREADS // 4
+# En-tête identifiant l'onglet auteur d'une écriture (voir invalidation_service).
+CLIENT_ID_HEADER = "X-Client-Id"
+EVENT_STREAM_KEEPALIVE_SECONDS = 15
+EVENT_STREAM_MAX_DURATION_SECONDS = 5 * 60
+EVENT_STREAM_QUEUE_SIZE = 100
+
+# Miroir local du catalogue IGDB.
+MIRROR_SEARCH_CANDIDATES = 200
+DEFAULT_MIRROR_SYNC_MAX_GAMES_PER_PLATFORM = 5000
+# Au-delà, une plateforme synchronisée en entier n'est plus considérée à jour.
+MIRROR_SYNC_FRESH_SECONDS = 7 * 24 * 60 * 60
+MIRROR_SYNC_CHECKPOINT_NAME = "igdb_mirror_sync"
+
+# Enrichissement en masse (`flask enrich`).
+DEFAULT_ENRICH_WORKERS = 2
+ENRICH_BUDGET_RETRIES = 5
+ENRICH_CHECKPOINT_NAME = "enrich"
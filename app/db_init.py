@@ -1,17 +1,298 @@
-from sqlalchemy import inspect, text
+"""Migrations de schéma versionnées.
 
+Chaque étape de `MIGRATIONS` s'exécute une seule fois, dans sa propre
+transaction, et son numéro est enregistré dans `schema_migrations`. Sous
+PostgreSQL un verrou consultatif sérialise les processus qui migrent en même
+temps. Au démarrage, un worker ne fait qu'une lecture du numéro de version.
+
+Les étapes doivent rester idempotentes: une base antérieure à ce mécanisme
+(tables créées par `create_all`) les rejoue toutes depuis le début. Elles
+décrivent le schéma de leur version, jamais les modèles courants: une
+nouvelle table, colonne ou un nouvel index passe par une nouvelle étape,
+ajoutée en fin de liste.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Callable
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from .constants import SCHEMA_MIGRATION_LOCK_KEY
 from .extensions import db
+from .models import SchemaMigration
+
+
+logger = logging.getLogger(__name__)
+
+_JSON = JSON().with_variant(JSONB(), "postgresql")
+
+# Schéma de la version 1, figé: il ne suit pas les modèles. Une base vierge
+# et une base migrée passent ainsi par exactement les mêmes étapes.
+_V1_METADATA = MetaData()
+
+_V1_SCHEMA_MIGRATIONS = Table(
+    "schema_migrations",
+    _V1_METADATA,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+Table(
+    "games",
+    _V1_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(255), nullable=False),
+    Column("platform", String(100), nullable=False),
+    Column("completed", Boolean, nullable=False),
+    Column("genre", String(255)),
+    Column("release_date", String(50)),
+    Column("cover_url", String(512)),
+    Column("description", Text),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "game_sheet_cache",
+    _V1_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("game_id", Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, unique=True, index=True),
+    Column("source_fingerprint", String(128), nullable=False),
+    Column("igdb_id", Integer),
+    Column("title", String(255)),
+    Column("release_date", String(50)),
+    Column("release_year", Integer),
+    Column("publisher", String(255)),
+    Column("cover_url", String(512)),
+    Column("description", Text),
+    Column("description_fr", Text),
+    Column("images_json", Text),
+    Column("videos_json", Text),
+    Column("cached_at", DateTime, nullable=False),
+)
+
+Table(
+    "collection_state",
+    _V1_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("version", BigInteger, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "metadata_cache",
+    _V1_METADATA,
+    Column("key", String(255), primary_key=True),
+    Column("value", _JSON),
+    Column("expires_at", DateTime, nullable=False, index=True),
+)
+
+Table(
+    "igdb_games",
+    _V1_METADATA,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("title", String(255), nullable=False),
+    Column("normalized_title", String(255), nullable=False, index=True),
+    Column("release_date", String(50)),
+    Column("cover_url", String(512)),
+    Column("genres", _JSON),
+    Column("platforms", _JSON),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "igdb_platforms",
+    _V1_METADATA,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("alternative_name", String(255)),
+    Column("normalized_name", String(255), nullable=False, index=True),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "game_igdb_matches",
+    _V1_METADATA,
+    Column("game_id", Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True),
+    Column("igdb_id", Integer, nullable=False),
+    Column("source_fingerprint", String(128), nullable=False),
+    Column("score", Integer, nullable=False),
+    Column("matched_at", DateTime, nullable=False),
+)
+
+Table(
+    "job_checkpoints",
+    _V1_METADATA,
+    Column("name", String(64), primary_key=True),
+    Column("state", _JSON, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def _create_initial_tables(connection: Connection) -> None:
+    # checkfirst: les tables d'une base antérieure aux migrations sont conservées.
+    _V1_METADATA.create_all(bind=connection)
+
+
+def _add_missing_columns(connection: Connection, table_name: str, definitions: dict[str, str]) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns(table_name)}
+    for name, definition in definitions.items():
+        if name not in columns:
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {definition}"))
+
 
+def _add_games_ownership_type(connection: Connection) -> None:
+    _add_missing_columns(connection, "games", {"ownership_type": "VARCHAR(20) NOT NULL DEFAULT 'unknown'"})
 
-def ensure_schema() -> None:
-    inspector = inspect(db.engine)
-    table_names = set(inspector.get_table_names())
-    if "games" not in table_names:
+
+def _add_sheet_cache_payload_columns(connection: Connection) -> None:
+    # Les anciennes colonnes images_json/videos_json restent en place, inutilisées:
+    # les lignes sans payload_json sont reconstruites à la prochaine lecture.
+    json_type = "JSONB" if connection.dialect.name == "postgresql" else "JSON"
+    _add_missing_columns(
+        connection,
+        "game_sheet_cache",
+        {
+            "images": json_type,
+            "videos": json_type,
+            "payload_json": "TEXT",
+            "overlay_fields": "VARCHAR(255) NOT NULL DEFAULT ''",
+        },
+    )
+
+
+def _add_igdb_title_trigram_index(connection: Connection) -> None:
+    # Index trigrammes de la recherche locale IGDB (PostgreSQL uniquement).
+    if connection.dialect.name != "postgresql":
         return
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_igdb_games_normalized_title_trgm "
+                    "ON igdb_games USING gin (normalized_title gin_trgm_ops)"
+                )
+            )
+    except SQLAlchemyError:
+        # Sans droit de créer l'extension, la recherche locale reste possible (sans index).
+        logger.warning("Extension pg_trgm indisponible, recherche locale IGDB non indexée.", exc_info=True)
+
 
-    columns = {column["name"] for column in inspector.get_columns("games")}
-    if "ownership_type" not in columns:
-        with db.engine.begin() as connection:
+_GAMES_LISTING_INDEXES = {
+    "ix_games_title_id": "title, id",
+    "ix_games_platform_title_id": "platform, title, id",
+    "ix_games_completed_title_id": "completed, title, id",
+}
+
+
+def _add_games_listing_indexes(connection: Connection) -> None:
+    for name, columns in _GAMES_LISTING_INDEXES.items():
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON games ({columns})"))
+
+
+def _add_games_sort_and_search_indexes(connection: Connection) -> None:
+    # Tris « plus récents » et « terminés d'abord » de /api/games.
+    connection.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_games_release_date_id ON games ((COALESCE(release_date, '')), id)")
+    )
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_games_completed_desc_title_id ON games (completed DESC, title, id)"))
+    if connection.dialect.name != "postgresql":
+        return
+    # Recherche par titre (`?q=`, ILIKE '%...%'), comme l'étape 4.
+    try:
+        with connection.begin_nested():
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             connection.execute(
-                text("ALTER TABLE games ADD COLUMN ownership_type VARCHAR(20) NOT NULL DEFAULT 'unknown'")
+                text("CREATE INDEX IF NOT EXISTS ix_games_title_trgm ON games USING gin (title gin_trgm_ops)")
             )
+    except SQLAlchemyError:
+        logger.warning("Extension pg_trgm indisponible, recherche par titre non indexée.", exc_info=True)
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "tables initiales", _create_initial_tables),
+    (2, "games.ownership_type", _add_games_ownership_type),
+    (3, "game_sheet_cache: médias JSONB et fiche pré-encodée", _add_sheet_cache_payload_columns),
+    (4, "index trigrammes igdb_games.normalized_title", _add_igdb_title_trigram_index),
+    (5, "index de liste et de filtre sur games", _add_games_listing_indexes),
+    (6, "index de tri et de recherche par titre sur games", _add_games_sort_and_search_indexes),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    """Dernière étape appliquée (0 pour une base vierge ou antérieure aux migrations)."""
+    try:
+        with db.engine.connect() as connection:
+            return connection.execute(select(func.max(SchemaMigration.version))).scalar() or 0
+    except SQLAlchemyError:
+        # Table schema_migrations absente.
+        return 0
+
+
+def upgrade_schema() -> list[tuple[int, str]]:
+    """Applique les étapes manquantes. Renvoie [(version, nom)] des étapes appliquées."""
+    applied: list[tuple[int, str]] = []
+    with db.engine.connect() as connection:
+        is_postgresql = connection.dialect.name == "postgresql"
+        if is_postgresql:
+            # Bloquant: un worker qui arrive pendant une migration attend sa fin.
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_MIGRATION_LOCK_KEY})
+            connection.commit()
+        try:
+            with connection.begin():
+                _V1_SCHEMA_MIGRATIONS.create(bind=connection, checkfirst=True)
+            # Relu sous le verrou: un autre processus a pu migrer entre-temps.
+            current = connection.execute(select(func.max(SchemaMigration.version))).scalar() or 0
+            connection.commit()
+
+            for version, name, step in MIGRATIONS:
+                if version <= current:
+                    continue
+                with connection.begin():
+                    step(connection)
+                    connection.execute(_V1_SCHEMA_MIGRATIONS.insert().values(version=version, name=name))
+                logger.info("Migration %s appliquée: %s.", version, name)
+                applied.append((version, name))
+        finally:
+            if is_postgresql:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_MIGRATION_LOCK_KEY})
+                connection.commit()
+    return applied
+
+
+def ensure_schema(auto_upgrade: bool = True) -> None:
+    """Vérification de démarrage: une requête si le schéma est à jour, migration sinon."""
+    version = get_schema_version()
+    if version >= LATEST_SCHEMA_VERSION:
+        return
+    if not auto_upgrade:
+        logger.warning(
+            "Schéma en version %s, %s attendue: lancer `flask --app run db-upgrade`.", version, LATEST_SCHEMA_VERSION
+        )
+        return
+    upgrade_schema()
@@ -0,0 +1,135 @@
+"""Sessions HTTP partagées pour IGDB, Twitch et Wikipédia.
+
+Un unique `HTTPAdapter` (pools keep-alive par hôte, thread-safe) est monté
+dans une session par thread: les connexions TCP/TLS sont réutilisées entre
+requêtes sans partager l'état (cookies) d'une `requests.Session` entre threads.
+
+Les appels IGDB passent par un adaptateur sans rejeu: chaque tentative doit
+reprendre un jeton du budget IGDB, c'est donc `igdb._igdb_request` qui rejoue
+(avec `retry_delay`).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import load_config
+from .constants import MAX_RETRY_AFTER_SECONDS
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Hôtes dont les rejeux sont gérés par l'appelant (préfixe de montage requests).
+_CALLER_RETRIED_PREFIXES = ("https://api.igdb.com/",)
+
+# Clé de config du délai de lecture par service.
+_READ_TIMEOUT_KEYS = {
+    "igdb": "IGDB_TIMEOUT_SECONDS",
+    "twitch": "IGDB_TIMEOUT_SECONDS",
+    "wikipedia": "WIKIPEDIA_TIMEOUT_SECONDS",
+}
+
+_lock = threading.Lock()
+_local = threading.local()
+_adapter: HTTPAdapter | None = None
+_no_retry_adapter: HTTPAdapter | None = None
+_settings: dict[str, Any] | None = None
+
+
+class _JitteredRetry(Retry):
+    # Backoff exponentiel + jitter: évite que tous les threads relancent
+    # IGDB au même instant après un 429.
+    def get_backoff_time(self) -> float:
+        base = super().get_backoff_time()
+        return base + random.uniform(0, base) if base else 0
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), MAX_RETRY_AFTER_SECONDS)
+
+
+def _get_settings() -> dict[str, Any]:
+    global _settings
+    if _settings is None:
+        _settings = load_config()
+    return _settings
+
+
+def _get_adapters() -> tuple[HTTPAdapter, HTTPAdapter]:
+    global _adapter, _no_retry_adapter
+    with _lock:
+        if _adapter is None:
+            settings = _get_settings()
+            retries = _JitteredRetry(
+                total=settings["HTTP_MAX_RETRIES"],
+                backoff_factor=settings["HTTP_BACKOFF_SECONDS"],
+                status_forcelist=RETRY_STATUS_CODES,
+                # Les POST IGDB/Twitch sont des lectures: on peut les rejouer.
+                allowed_methods=frozenset({"GET", "POST"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            pool_size = max(int(settings["HTTP_POOL_SIZE"]), 1)
+            # pool_connections: nombre d'hôtes gardés en pool (Twitch, IGDB, Wikipédia).
+            # pool_block: au-delà de pool_size appels simultanés vers un hôte, on
+            # attend une connexion libre plutôt que d'en ouvrir une jetée aussitôt.
+            _adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=retries)
+            # Ni rejeu ni attente: une erreur de connexion lève, un 429/5xx est renvoyé tel quel.
+            _no_retry_adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                pool_block=True,
+                max_retries=Retry(total=0, status=0, raise_on_status=False),
+            )
+        return _adapter, _no_retry_adapter
+
+
+def get_session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        adapter, no_retry_adapter = _get_adapters()
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # requests choisit le préfixe monté le plus long.
+        for prefix in _CALLER_RETRIED_PREFIXES:
+            session.mount(prefix, no_retry_adapter)
+        _local.session = session
+    return session
+
+
+def max_retries() -> int:
+    return max(int(_get_settings()["HTTP_MAX_RETRIES"]), 0)
+
+
+def retry_delay(attempt: int, response: requests.Response | None = None) -> float:
+    """Attente avant le rejeu n° `attempt` (à partir de 1).
+
+    Retry-After de la réponse s'il est présent (plafonné), backoff exponentiel
+    avec jitter sinon.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return _JitteredRetry().parse_retry_after(retry_after)
+        except Exception:
+            pass
+    base = float(_get_settings()["HTTP_BACKOFF_SECONDS"]) * (2 ** (attempt - 1))
+    return base + random.uniform(0, base) if base else 0
+
+
+def get_timeout(service: str) -> tuple[float, float]:
+    settings = _get_settings()
+    return settings["HTTP_CONNECT_TIMEOUT_SECONDS"], settings[_READ_TIMEOUT_KEYS[service]]
+
+
+def http_get(url: str, service: str, **kwargs: Any) -> requests.Response:
+    return get_session().get(url, timeout=get_timeout(service), **kwargs)
+
+
+def http_post(url: str, service: str, **kwargs: Any) -> requests.Response:
+    return get_session().post(url, timeout=get_timeout(service), **kwargs)
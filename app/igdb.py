@@ -1,22 +1,188 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Iterator
 
 import requests
 
+from .config import load_config
+from .constants import WIKIPEDIA_SEARCH_WORKERS
+from .http_client import RETRY_STATUS_CODES, http_get, http_post, max_retries, retry_delay
+from .shared_cache import SharedCache
+from .singleflight import single_flight
+from .ttl_cache import TTLCache
+
 
 TWITCH_TOKEN_URL = "https://id.twitch.tv/oauth2/token"
 IGDB_GAMES_URL = "https://api.igdb.com/v4/games"
 IGDB_PLATFORMS_URL = "https://api.igdb.com/v4/platforms"
+IGDB_MULTIQUERY_URL = "https://api.igdb.com/v4/multiquery"
 WIKIPEDIA_API_FR = "https://fr.wikipedia.org/w/api.php"
 
-_token_cache: dict[str, Any] = {
-    "access_token": None,
-    "expires_at": 0,
+# Caches bornés, partagés entre workers via la table metadata_cache; les
+# résultats négatifs expirent vite pour ne pas figer une erreur passagère
+# (timeout Wikipédia, IGDB indisponible).
+_token_cache = SharedCache(
+    "twitch_token",
+    TTLCache(max_entries=4, ttl_seconds=60 * 60, negative_ttl_seconds=0),
+)
+_french_summary_cache = SharedCache(
+    "wiki_fr_summary",
+    TTLCache(
+        max_entries=2000,
+        max_bytes=8 * 1024 * 1024,
+        ttl_seconds=7 * 24 * 60 * 60,
+        negative_ttl_seconds=10 * 60,
+    ),
+)
+_platform_id_cache = SharedCache(
+    "igdb_platform_ids",
+    TTLCache(max_entries=256, ttl_seconds=24 * 60 * 60, negative_ttl_seconds=10 * 60),
+)
+# Résultats de recherche: mémoire du worker uniquement (volumineux, courte durée).
+# Une entrée est {"results", "candidates", "complete", "fetched_at"}: au-delà de
+# SEARCH_RESULTS_FRESH_SECONDS elle est encore servie mais rafraîchie en arrière-plan.
+SEARCH_RESULTS_FRESH_SECONDS = 2 * 60
+_search_results_cache = TTLCache(
+    max_entries=500,
+    max_bytes=4 * 1024 * 1024,
+    ttl_seconds=10 * 60,
+    negative_ttl_seconds=60,
+    is_negative=lambda entry: not entry["results"],
+)
+# Recherches Wikipédia parallèles (variantes d'un même titre, titres d'un lot).
+_wikipedia_executor = ThreadPoolExecutor(max_workers=WIKIPEDIA_SEARCH_WORKERS, thread_name_prefix="wikipedia")
+# Limite `exlimit` de prop=extracts avec exintro.
+WIKIPEDIA_EXTRACTS_BATCH_SIZE = 20
+_search_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="igdb-search-refresh")
+_search_refreshing: set[tuple] = set()
+_search_refreshing_lock = threading.Lock()
+
+# Limites IGDB: 10 sous-requêtes par multiquery, 500 résultats par requête.
+IGDB_MULTIQUERY_MAX_QUERIES = 10
+IGDB_MAX_LIMIT = 500
+
+_SEARCH_FIELDS = "id, name, first_release_date, genres.name, platforms.name, cover.url"
+_DETAILS_FIELDS = (
+    "id, name, first_release_date, genres.name, platforms.name, cover.url, artworks.url, "
+    "screenshots.url, summary, videos.name, videos.video_id, involved_companies.publisher, "
+    "involved_companies.company.name"
+)
+
+# Classes de priorité des appels IGDB (plus petit = plus prioritaire).
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SHEET_BUILD = 1
+PRIORITY_BACKGROUND = 2
+
+# (profondeur de file max, attente max en secondes) par classe de priorité.
+_PRIORITY_LIMITS: dict[int, tuple[int, float]] = {
+    PRIORITY_INTERACTIVE: (16, 5.0),
+    PRIORITY_SHEET_BUILD: (32, 15.0),
+    PRIORITY_BACKGROUND: (8, 30.0),
 }
-_french_summary_cache: dict[str, str | None] = {}
-_platform_id_cache: dict[str, list[int]] = {}
+
+
+class IgdbBudgetExceeded(RuntimeError):
+    """Le budget IGDB ne permet pas de servir l'appel dans le délai imparti."""
+
+
+class _IgdbScheduler:
+    """Token bucket + limite de concurrence, servi par ordre de priorité.
+
+    Les appels en attente forment un tas (priorité, ordre d'arrivée): seul le
+    premier du tas peut consommer un jeton. Un appel dont l'attente estimée
+    dépasse la limite de sa classe échoue immédiatement.
+    """
+
+    def __init__(self, rate_per_second: float, max_concurrent: int) -> None:
+        self._rate = max(rate_per_second, 0.1)
+        self._burst = max(self._rate, 1.0)
+        self._max_concurrent = max(max_concurrent, 1)
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._active = 0
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def _acquire(self, priority: int) -> None:
+        max_depth, max_wait = _PRIORITY_LIMITS[priority]
+        with self._condition:
+            ahead = sum(1 for waiting_priority, _ in self._waiting if waiting_priority <= priority)
+            if ahead >= max_depth:
+                raise IgdbBudgetExceeded("File d'attente IGDB saturée.")
+
+            now = time.monotonic()
+            self._refill(now)
+            if (ahead + 1 - self._tokens) / self._rate > max_wait:
+                raise IgdbBudgetExceeded("Budget IGDB épuisé.")
+
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            deadline = now + max_wait
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiting[0] == entry and self._tokens >= 1 and self._active < self._max_concurrent:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= 1
+                        self._active += 1
+                        self._condition.notify_all()
+                        return
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise IgdbBudgetExceeded("Délai d'attente IGDB dépassé.")
+                    if self._tokens < 1:
+                        remaining = min(remaining, (1 - self._tokens) / self._rate)
+                    self._condition.wait(remaining)
+            except BaseException:
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._condition.notify_all()
+                raise
+
+    def _release(self) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int) -> Iterator[None]:
+        self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+_scheduler: _IgdbScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def _get_scheduler() -> _IgdbScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            settings = load_config()
+            _scheduler = _IgdbScheduler(
+                rate_per_second=float(settings["IGDB_REQUESTS_PER_SECOND"]),
+                max_concurrent=int(settings["IGDB_MAX_CONCURRENT_REQUESTS"]),
+            )
+        return _scheduler
 
 
 def _format_date(unix_ts: int | None) -> str | None:
@@ -98,101 +264,177 @@ def _extract_videos(item: dict[str, Any]) -> list[dict[str, str]]:
     return videos
 
 
-def _fetch_french_summary(title: str) -> str | None:
-    if not title:
-        return None
+def _normalize_key_text(value: str | None) -> str:
+    return " ".join((value or "").lower().split())
 
-    cache_key = title.strip().lower()
-    if cache_key in _french_summary_cache:
-        return _french_summary_cache[cache_key]
 
-    search_queries = [
+def _wikipedia_search_variants(title: str) -> list[str]:
+    # Par ordre de préférence.
+    return [
         f'intitle:"{title}" jeu vidéo',
         f'"{title}" jeu vidéo',
         title,
     ]
 
-    try:
-        for search_query in search_queries:
-            search_response = requests.get(
-                WIKIPEDIA_API_FR,
-                params={
-                    "action": "query",
-                    "list": "search",
-                    "srsearch": search_query,
-                    "utf8": 1,
-                    "format": "json",
-                },
-                timeout=2.5,
-            )
-            search_response.raise_for_status()
-            search_data = search_response.json()
 
-            search_results = (search_data.get("query") or {}).get("search") or []
-            if not search_results:
-                continue
+def _search_wikipedia_page(search_query: str) -> str | None:
+    search_response = http_get(
+        WIKIPEDIA_API_FR,
+        service="wikipedia",
+        params={
+            "action": "query",
+            "list": "search",
+            "srsearch": search_query,
+            "utf8": 1,
+            "format": "json",
+        },
+    )
+    search_response.raise_for_status()
+    search_data = search_response.json()
+
+    search_results = (search_data.get("query") or {}).get("search") or []
+    if not search_results:
+        return None
 
-            # Favorise une page liée au jeu vidéo.
-            best_result = search_results[0]
-            for candidate in search_results:
-                snippet = (candidate.get("snippet") or "").lower()
-                title_candidate = (candidate.get("title") or "").lower()
-                if "jeu vidéo" in snippet or "jeu vidéo" in title_candidate:
-                    best_result = candidate
-                    break
+    # Favorise une page liée au jeu vidéo.
+    best_result = search_results[0]
+    for candidate in search_results:
+        snippet = (candidate.get("snippet") or "").lower()
+        title_candidate = (candidate.get("title") or "").lower()
+        if "jeu vidéo" in snippet or "jeu vidéo" in title_candidate:
+            best_result = candidate
+            break
+
+    return best_result.get("title") or None
+
+
+def _resolve_wikipedia_pages(titles: list[str]) -> dict[str, list[str]]:
+    """Pages Wikipédia candidates par titre, par ordre de préférence.
+
+    Toutes les variantes de recherche de tous les titres partent en parallèle.
+    Pour un titre, la première variante (dans l'ordre de préférence) qui trouve
+    une page l'emporte: les variantes suivantes pas encore lancées sont
+    annulées, celles déjà terminées servent de secours si l'extrait est vide.
+    """
+    futures = {
+        title: [_wikipedia_executor.submit(_search_wikipedia_page, query) for query in _wikipedia_search_variants(title)]
+        for title in titles
+    }
 
-            page_title = best_result.get("title")
+    pages: dict[str, list[str]] = {}
+    for title, title_futures in futures.items():
+        candidates: list[str] = []
+        for index, future in enumerate(title_futures):
+            try:
+                page_title = future.result()
+            except Exception:
+                page_title = None
             if not page_title:
                 continue
 
-            extract_response = requests.get(
-                WIKIPEDIA_API_FR,
-                params={
-                    "action": "query",
-                    "prop": "extracts",
-                    "explaintext": 1,
-                    "exintro": 1,
-                    "titles": page_title,
-                    "utf8": 1,
-                    "format": "json",
-                },
-                timeout=2.5,
-            )
-            extract_response.raise_for_status()
-            extract_data = extract_response.json()
-
-            pages = ((extract_data.get("query") or {}).get("pages") or {}).values()
-            for page in pages:
-                extract = (page or {}).get("extract")
-                if extract:
-                    result = str(extract).strip()
-                    _french_summary_cache[cache_key] = result
-                    return result
+            candidates.append(page_title)
+            for other in title_futures[index + 1 :]:
+                if other.done() and not other.cancelled() and other.exception() is None and other.result():
+                    candidates.append(other.result())
+                else:
+                    other.cancel()
+            break
+        pages[title] = list(dict.fromkeys(candidates))
+    return pages
+
+
+def _fetch_wikipedia_extracts(page_titles: list[str]) -> dict[str, str]:
+    """Introductions des pages, par lots de `titles=A|B|C`."""
+    unique_titles = list(dict.fromkeys(page_titles))
+    extracts: dict[str, str] = {}
+    for start in range(0, len(unique_titles), WIKIPEDIA_EXTRACTS_BATCH_SIZE):
+        chunk = unique_titles[start : start + WIKIPEDIA_EXTRACTS_BATCH_SIZE]
+        extract_response = http_get(
+            WIKIPEDIA_API_FR,
+            service="wikipedia",
+            params={
+                "action": "query",
+                "prop": "extracts",
+                "explaintext": 1,
+                "exintro": 1,
+                "exlimit": "max",
+                "titles": "|".join(chunk),
+                "utf8": 1,
+                "format": "json",
+            },
+        )
+        extract_response.raise_for_status()
+        query_data = extract_response.json().get("query") or {}
+
+        # Wikipédia renvoie le titre normalisé: on garde aussi le titre demandé.
+        requested_by_title = {item.get("to"): item.get("from") for item in query_data.get("normalized") or []}
+        for page in (query_data.get("pages") or {}).values():
+            extract = str((page or {}).get("extract") or "").strip()
+            page_title = (page or {}).get("title")
+            if not extract or not page_title:
+                continue
+            extracts[page_title] = extract
+            if page_title in requested_by_title:
+                extracts[requested_by_title[page_title]] = extract
+    return extracts
+
+
+def _french_summary_key(title: str) -> str:
+    return title.strip().lower()
+
+
+def fetch_french_summaries(titles: list[str]) -> dict[str, str | None]:
+    """Résumés Wikipédia FR de plusieurs jeux (None si introuvable).
+
+    Recherches en parallèle puis un appel `extracts` par lot de 20 pages.
+    """
+    summaries: dict[str, str | None] = {}
+    missing: list[str] = []
+    for title in dict.fromkeys(title for title in titles if title):
+        found, cached = _french_summary_cache.lookup(_french_summary_key(title))
+        if found:
+            summaries[title] = cached
+        else:
+            missing.append(title)
+
+    if not missing:
+        return summaries
+
+    try:
+        pages = _resolve_wikipedia_pages(missing)
+        extracts = _fetch_wikipedia_extracts([page for candidates in pages.values() for page in candidates])
     except Exception:
-        _french_summary_cache[cache_key] = None
-        return None
+        pages, extracts = {}, {}
 
-    _french_summary_cache[cache_key] = None
-    return None
+    for title in missing:
+        summary = next((extracts[page] for page in pages.get(title, []) if page in extracts), None)
+        _french_summary_cache.set(_french_summary_key(title), summary)
+        summaries[title] = summary
+    return summaries
+
+
+@single_flight(lambda title: _normalize_key_text(title))
+def _fetch_french_summary(title: str) -> str | None:
+    if not title:
+        return None
+    return fetch_french_summaries([title]).get(title)
 
 
 def _get_access_token(client_id: str, client_secret: str) -> str:
     now_ts = datetime.now(tz=timezone.utc).timestamp()
 
-    cached_token = _token_cache.get("access_token")
-    expires_at = _token_cache.get("expires_at", 0)
-
-    if cached_token and now_ts < float(expires_at):
-        return str(cached_token)
+    _, cached = _token_cache.lookup(client_id)
+    if cached and now_ts < float(cached.get("expires_at", 0)):
+        return str(cached["access_token"])
 
-    response = requests.post(
+    response = http_post(
         TWITCH_TOKEN_URL,
+        service="twitch",
         params={
             "client_id": client_id,
             "client_secret": client_secret,
             "grant_type": "client_credentials",
         },
-        timeout=10,
     )
     response.raise_for_status()
 
@@ -204,28 +446,78 @@ def _get_access_token(client_id: str, client_secret: str) -> str:
         raise ValueError("Token Twitch/IGDB invalide.")
 
     # 60 sec de marge pour éviter l'expiration en cours de requête.
-    _token_cache["access_token"] = access_token
-    _token_cache["expires_at"] = now_ts + max(expires_in - 60, 60)
+    ttl_seconds = max(expires_in - 60, 60)
+    _token_cache.set(
+        client_id,
+        {"access_token": access_token, "expires_at": now_ts + ttl_seconds},
+        ttl_seconds=ttl_seconds,
+    )
 
     return str(access_token)
 
 
-def _igdb_request(client_id: str, client_secret: str, query: str, endpoint: str = IGDB_GAMES_URL) -> list[dict[str, Any]]:
+def _igdb_request(
+    client_id: str,
+    client_secret: str,
+    query: str,
+    endpoint: str = IGDB_GAMES_URL,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> list[dict[str, Any]]:
     token = _get_access_token(client_id=client_id, client_secret=client_secret)
+    scheduler = _get_scheduler()
+    attempts = max_retries() + 1
+
+    for attempt in range(1, attempts + 1):
+        # Chaque tentative reprend un jeton: les rejeux restent dans le budget
+        # IGDB, et l'attente entre deux tentatives libère le créneau.
+        with scheduler.slot(priority):
+            try:
+                response = http_post(
+                    endpoint,
+                    service="igdb",
+                    headers={
+                        "Client-ID": client_id,
+                        "Authorization": f"Bearer {token}",
+                    },
+                    data=query,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == attempts:
+                    raise
+                response = None
+        if response is not None and (response.status_code not in RETRY_STATUS_CODES or attempt == attempts):
+            break
+        time.sleep(retry_delay(attempt, response))
 
-    response = requests.post(
-        endpoint,
-        headers={
-            "Client-ID": client_id,
-            "Authorization": f"Bearer {token}",
-        },
-        data=query,
-        timeout=10,
-    )
     response.raise_for_status()
     return response.json()
 
 
+def _igdb_multiquery(
+    client_id: str,
+    client_secret: str,
+    queries: list[tuple[str, str, str]],
+    priority: int = PRIORITY_INTERACTIVE,
+) -> dict[str, list[dict[str, Any]]]:
+    """Exécute plusieurs requêtes IGDB en un seul aller-retour.
+
+    `queries` contient des tuples (endpoint, nom, corps). Renvoie les
+    résultats indexés par nom.
+    """
+    if len(queries) > IGDB_MULTIQUERY_MAX_QUERIES:
+        raise ValueError("Trop de sous-requêtes IGDB.")
+
+    body = "\n".join(f'query {endpoint} "{name}" {{ {query} }};' for endpoint, name, query in queries)
+    rows = _igdb_request(
+        client_id=client_id,
+        client_secret=client_secret,
+        query=body,
+        endpoint=IGDB_MULTIQUERY_URL,
+        priority=priority,
+    )
+    return {row.get("name"): row.get("result") or [] for row in rows}
+
+
 def _escape_igdb_search(value: str) -> str:
     return value.replace("\\", "\\\\").replace('"', '\\"').strip()
 
@@ -245,13 +537,11 @@ def _normalize_platform_text(value: str) -> str:
     return "".join(ch for ch in value.lower().strip() if ch.isalnum())
 
 
-def _normalize_title_text(value: str) -> str:
+def normalize_title_text(value: str) -> str:
     return "".join(ch for ch in value.lower().strip() if ch.isalnum() or ch.isspace())
 
 
-def _score_title_match(title: str, query: str) -> int:
-    t = _normalize_title_text(title)
-    q = _normalize_title_text(query)
+def _score_normalized_title(t: str, q: str, q_tokens: tuple[str, ...]) -> int:
     if not t or not q:
         return 0
     if t == q:
@@ -261,13 +551,23 @@ def _score_title_match(title: str, query: str) -> int:
     if q in t:
         return 180
 
-    q_tokens = [token for token in q.split(" ") if token]
     score = sum(20 for token in q_tokens if token in t)
     # Léger bonus si la longueur est proche (réduit le bruit).
     score -= abs(len(t) - len(q)) // 6
     return score
 
 
+def score_title_matches(titles: list[str], query: str) -> list[int]:
+    """Score de chaque titre face à la requête, normalisée une seule fois."""
+    q = normalize_title_text(query)
+    q_tokens = tuple(token for token in q.split(" ") if token)
+    return [_score_normalized_title(normalize_title_text(title), q, q_tokens) for title in titles]
+
+
+def score_title_match(title: str, query: str) -> int:
+    return score_title_matches([title], query)[0]
+
+
 _PLATFORM_EQUIV: dict[str, set[str]] = {
     "pc": {"pc", "windows", "microsoftwindows", "computer"},
     "nes": {"nes", "nintendoentertainmentsystem", "famicom"},
@@ -290,20 +590,45 @@ _PLATFORM_EQUIV: dict[str, set[str]] = {
 }
 
 
-def _expanded_platform_terms(value: str) -> set[str]:
+# Index compilé à l'import: terme normalisé -> identifiant canonique.
+_PLATFORM_ALIAS_INDEX: dict[str, str] = {
+    alias: canonical for canonical, aliases in _PLATFORM_EQUIV.items() for alias in (canonical, *aliases)
+}
+_PLATFORM_CANONICAL_TERMS: dict[str, frozenset[str]] = {
+    canonical: frozenset({canonical, *aliases}) for canonical, aliases in _PLATFORM_EQUIV.items()
+}
+
+
+@lru_cache(maxsize=1024)
+def _expanded_platform_terms(value: str) -> frozenset[str]:
     normalized = _normalize_platform_text(value)
     if not normalized:
-        return set()
-
-    terms = {normalized}
-    for canonical, aliases in _PLATFORM_EQUIV.items():
-        if normalized == canonical or normalized in aliases:
-            terms.add(canonical)
-            terms.update(aliases)
-    return terms
+        return frozenset()
+
+    canonical = _PLATFORM_ALIAS_INDEX.get(normalized)
+    if canonical is None:
+        return frozenset({normalized})
+    return _PLATFORM_CANONICAL_TERMS[canonical] | {normalized}
+
+
+@lru_cache(maxsize=4096)
+def _platform_matches(wanted: str, platform_name: str) -> bool:
+    # Les noms de plateformes IGDB sont peu nombreux: la décision est mémorisée.
+    wanted_terms = _expanded_platform_terms(wanted)
+    platform_terms = _expanded_platform_terms(platform_name)
+    return any(
+        (wanted_term in current or current in wanted_term)
+        for wanted_term in wanted_terms
+        for current in platform_terms
+    )
 
 
-def _resolve_platform_ids(client_id: str, client_secret: str, platform: str | None) -> list[int]:
+def _resolve_platform_ids(
+    client_id: str,
+    client_secret: str,
+    platform: str | None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> list[int]:
     if not platform:
         return []
 
@@ -311,8 +636,9 @@ def _resolve_platform_ids(client_id: str, client_secret: str, platform: str | No
     if not normalized:
         return []
 
-    if normalized in _platform_id_cache:
-        return _platform_id_cache[normalized]
+    found, cached = _platform_id_cache.lookup(normalized)
+    if found:
+        return cached
 
     terms = sorted(_expanded_platform_terms(platform), key=len, reverse=True)
     search_term = terms[0] if terms else normalized
@@ -322,7 +648,13 @@ def _resolve_platform_ids(client_id: str, client_secret: str, platform: str | No
         search "{_escape_igdb_search(search_term)}";
         limit 20;
     '''
-    rows = _igdb_request(client_id=client_id, client_secret=client_secret, query=query, endpoint=IGDB_PLATFORMS_URL)
+    rows = _igdb_request(
+        client_id=client_id,
+        client_secret=client_secret,
+        query=query,
+        endpoint=IGDB_PLATFORMS_URL,
+        priority=priority,
+    )
 
     ids: list[int] = []
     for row in rows:
@@ -340,40 +672,22 @@ def _resolve_platform_ids(client_id: str, client_secret: str, platform: str | No
 
     # Déduplique en conservant l'ordre.
     deduped = list(dict.fromkeys(ids))
-    _platform_id_cache[normalized] = deduped
+    _platform_id_cache.set(normalized, deduped)
     return deduped
 
 
-def _filter_results_by_platform(results: list[dict[str, Any]], platform: str | None) -> list[dict[str, Any]]:
-    if not platform:
-        return results
-
-    wanted_terms = _expanded_platform_terms(platform)
-    if not wanted_terms:
-        return results
-
-    filtered: list[dict[str, Any]] = []
-    for item in results:
-        platforms = item.get("platforms", []) or []
-        normalized_platforms = [_normalize_platform_text(p) for p in platforms if p]
-        matched = False
-
-        for platform_name in normalized_platforms:
-            platform_terms = _expanded_platform_terms(platform_name)
-            if not platform_terms:
-                continue
-            if any(
-                (wanted in current or current in wanted)
-                for wanted in wanted_terms
-                for current in platform_terms
-            ):
-                matched = True
-                break
+def platform_matches(platform: str | None, platform_names: list[str]) -> bool:
+    """Vrai si l'une des plateformes IGDB correspond (alias compris) à `platform`."""
+    wanted = _normalize_platform_text(platform or "")
+    if not wanted:
+        return True
+    return any(_platform_matches(wanted, platform_name) for platform_name in platform_names if platform_name)
 
-        if matched:
-            filtered.append(item)
 
-    return filtered
+def _filter_results_by_platform(results: list[dict[str, Any]], platform: str | None) -> list[dict[str, Any]]:
+    if not platform or not _normalize_platform_text(platform):
+        return results
+    return [item for item in results if platform_matches(platform, item.get("platforms") or [])]
 
 
 def _finalize_results(results: list[dict[str, Any]], query: str, page_size: int) -> list[dict[str, Any]]:
@@ -383,125 +697,307 @@ def _finalize_results(results: list[dict[str, Any]], query: str, page_size: int)
         if isinstance(igdb_id, int) and igdb_id not in deduped:
             deduped[igdb_id] = item
 
-    ranked = sorted(
-        deduped.values(),
-        key=lambda item: _score_title_match(str(item.get("title") or ""), query),
-        reverse=True,
+    items = list(deduped.values())
+    scores = score_title_matches([str(item.get("title") or "") for item in items], query)
+    # Tri stable: à score égal, l'ordre IGDB est conservé.
+    order = sorted(range(len(items)), key=scores.__getitem__, reverse=True)
+    return [items[index] for index in order[:page_size]]
+
+
+def rank_search_results(
+    results: list[dict[str, Any]],
+    query: str,
+    page_size: int,
+    platform: str | None = None,
+) -> list[dict[str, Any]]:
+    """Filtre par plateforme puis classe des résultats déjà normalisés."""
+    return _finalize_results(_filter_results_by_platform(results, platform), query, page_size)
+
+
+def list_platforms(
+    client_id: str,
+    client_secret: str,
+    priority: int = PRIORITY_BACKGROUND,
+) -> list[dict[str, Any]]:
+    """Toutes les plateformes IGDB (id, name, alternative_name)."""
+    platforms: list[dict[str, Any]] = []
+    offset = 0
+    while True:
+        rows = _igdb_request(
+            client_id=client_id,
+            client_secret=client_secret,
+            query=f"fields id, name, alternative_name; sort id asc; limit {IGDB_MAX_LIMIT}; offset {offset};",
+            endpoint=IGDB_PLATFORMS_URL,
+            priority=priority,
+        )
+        platforms.extend(rows)
+        if len(rows) < IGDB_MAX_LIMIT:
+            return platforms
+        offset += IGDB_MAX_LIMIT
+
+
+def list_platform_games(
+    client_id: str,
+    client_secret: str,
+    platform: str,
+    offset: int = 0,
+    limit: int = IGDB_MAX_LIMIT,
+    priority: int = PRIORITY_BACKGROUND,
+) -> list[dict[str, Any]]:
+    """Une page des jeux IGDB d'une plateforme, triés par id (synchronisation en masse)."""
+    platform_ids = _resolve_platform_ids(
+        client_id=client_id,
+        client_secret=client_secret,
+        platform=platform,
+        priority=priority,
     )
-    return ranked[:page_size]
+    if not platform_ids:
+        return []
+
+    rows = _igdb_request(
+        client_id=client_id,
+        client_secret=client_secret,
+        query=(
+            f"fields {_SEARCH_FIELDS}; where platforms = ({','.join(str(pid) for pid in platform_ids)}); "
+            f"sort id asc; limit {min(limit, IGDB_MAX_LIMIT)}; offset {offset};"
+        ),
+        priority=priority,
+    )
+    return [_normalize_game_item(item) for item in rows]
 
 
+def _search_games_key(
+    client_id: str,
+    client_secret: str,
+    query: str,
+    page_size: int = 5,
+    platform: str | None = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    on_remote_results: Callable[[list[dict[str, Any]]], None] | None = None,
+) -> tuple:
+    # Ni la priorité ni l'observateur n'entrent dans la clé: un appel identique
+    # déjà en vol est partagé (et ses résultats observés une seule fois).
+    return client_id, _normalize_key_text(query), _normalize_platform_text(platform or ""), page_size
+
+
+@single_flight(_search_games_key)
 def search_games(
     client_id: str,
     client_secret: str,
     query: str,
     page_size: int = 5,
     platform: str | None = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    on_remote_results: Callable[[list[dict[str, Any]]], None] | None = None,
 ) -> list[dict[str, Any]]:
+    """Recherche IGDB mémorisée (stale-while-revalidate).
+
+    `on_remote_results` n'est appelé qu'avec des résultats tout juste reçus
+    d'IGDB, y compris lors d'un rafraîchissement en arrière-plan.
+    """
     if not client_id or not client_secret:
         raise ValueError("IGDB_CLIENT_ID ou IGDB_CLIENT_SECRET manquant.")
 
+    cache_key = _search_games_key(client_id, client_secret, query, page_size, platform)
+    entry = _search_results_cache.get(cache_key)
+    if entry is not None:
+        if time.time() - entry["fetched_at"] > SEARCH_RESULTS_FRESH_SECONDS:
+            _schedule_search_refresh(cache_key, client_id, client_secret, query, page_size, platform, on_remote_results)
+        return list(entry["results"])
+
+    entry = _search_from_cached_prefix(cache_key, query, page_size)
+    if entry is None:
+        entry = _search_games_remote(
+            client_id=client_id,
+            client_secret=client_secret,
+            query=query,
+            page_size=page_size,
+            platform=platform,
+            priority=priority,
+        )
+        _search_results_cache.set(cache_key, entry)
+        _notify_remote_results(on_remote_results, entry["results"])
+    return list(entry["results"])
+
+
+def refresh_search_games(
+    client_id: str,
+    client_secret: str,
+    query: str,
+    page_size: int = 5,
+    platform: str | None = None,
+    on_remote_results: Callable[[list[dict[str, Any]]], None] | None = None,
+) -> None:
+    """Planifie la recherche IGDB en arrière-plan, sauf si un résultat récent est en cache."""
+    if not client_id or not client_secret:
+        return
+    cache_key = _search_games_key(client_id, client_secret, query, page_size, platform)
+    entry = _search_results_cache.get(cache_key)
+    if entry is not None and time.time() - entry["fetched_at"] <= SEARCH_RESULTS_FRESH_SECONDS:
+        return
+    _schedule_search_refresh(cache_key, client_id, client_secret, query, page_size, platform, on_remote_results)
+
+
+def _notify_remote_results(
+    handler: Callable[[list[dict[str, Any]]], None] | None,
+    results: list[dict[str, Any]],
+) -> None:
+    if handler is None:
+        return
+    try:
+        handler(list(results))
+    except Exception:
+        # Simple observateur: la recherche a déjà son résultat.
+        pass
+
+
+def _search_from_cached_prefix(cache_key: tuple, query: str, page_size: int) -> dict[str, Any] | None:
+    """Répond localement depuis le résultat complet d'un préfixe plus court.
+
+    Un jeu dont le nom contient la requête contient aussi chacun de ses
+    préfixes: si l'ensemble des correspondances d'un préfixe a été récupéré
+    en entier, il suffit de le filtrer.
+    """
+    client_id, normalized_query, normalized_platform, _ = cache_key
+    for length in range(len(normalized_query) - 1, 0, -1):
+        prefix_key = (client_id, normalized_query[:length].rstrip(), normalized_platform, page_size)
+        if not prefix_key[1] or prefix_key == cache_key:
+            continue
+        prefix_entry = _search_results_cache.get(prefix_key)
+        if prefix_entry is None or not prefix_entry["complete"]:
+            continue
+
+        candidates = [
+            item
+            for item in prefix_entry["candidates"]
+            if normalized_query in _normalize_key_text(str(item.get("title") or ""))
+        ]
+        if not candidates:
+            # La recherche plein texte IGDB tolère des variantes que le filtre
+            # par sous-chaîne ignore: on laisse IGDB trancher.
+            return None
+
+        entry = {
+            "results": _finalize_results(candidates, query, page_size),
+            "candidates": candidates,
+            "complete": True,
+            "fetched_at": prefix_entry["fetched_at"],
+        }
+        remaining = _search_results_cache.ttl_seconds - (time.time() - prefix_entry["fetched_at"])
+        if remaining > 0:
+            _search_results_cache.set(cache_key, entry, ttl_seconds=remaining)
+        return entry
+    return None
+
+
+def _schedule_search_refresh(
+    cache_key: tuple,
+    client_id: str,
+    client_secret: str,
+    query: str,
+    page_size: int,
+    platform: str | None,
+    on_remote_results: Callable[[list[dict[str, Any]]], None] | None = None,
+) -> None:
+    with _search_refreshing_lock:
+        if cache_key in _search_refreshing:
+            return
+        _search_refreshing.add(cache_key)
+
+    def refresh() -> None:
+        try:
+            entry = _search_games_remote(
+                client_id=client_id,
+                client_secret=client_secret,
+                query=query,
+                page_size=page_size,
+                platform=platform,
+                priority=PRIORITY_BACKGROUND,
+            )
+            _search_results_cache.set(cache_key, entry)
+            _notify_remote_results(on_remote_results, entry["results"])
+        except Exception:
+            # L'entrée périmée reste servie jusqu'à son expiration.
+            pass
+        finally:
+            with _search_refreshing_lock:
+                _search_refreshing.discard(cache_key)
+
+    _search_refresh_executor.submit(refresh)
+
+
+def _search_games_remote(
+    client_id: str,
+    client_secret: str,
+    query: str,
+    page_size: int,
+    platform: str | None,
+    priority: int,
+) -> dict[str, Any]:
     safe_query = _escape_igdb_search(query)
 
-    platform_ids = _resolve_platform_ids(client_id=client_id, client_secret=client_secret, platform=platform)
+    platform_ids = _resolve_platform_ids(
+        client_id=client_id,
+        client_secret=client_secret,
+        platform=platform,
+        priority=priority,
+    )
     platform_clause = f"platforms = ({','.join(str(pid) for pid in platform_ids)})" if platform_ids else ""
     platform_where = f"where {platform_clause};" if platform_clause else ""
 
     fetch_limit = max(page_size * 8, 40)
 
     # Requête principale: recherche full-text IGDB.
-    igdb_query = f'''
-        fields
-            id,
-            name,
-            first_release_date,
-            genres.name,
-            platforms.name,
-            cover.url;
-        search "{safe_query}";
-        {platform_where}
-        limit {fetch_limit};
-    '''
-
-    results = _igdb_request(client_id=client_id, client_secret=client_secret, query=igdb_query)
+    queries = [("games", "main", f'fields {_SEARCH_FIELDS}; search "{safe_query}"; {platform_where} limit {fetch_limit};')]
 
     # Requête de secours: correspondance partielle sur le nom.
-    if not results:
-        fallback_where_parts = [f'name ~ *"{safe_query}"*']
-        if platform_clause:
-            fallback_where_parts.append(platform_clause)
-        fallback_where = f"where {' & '.join(fallback_where_parts)};"
-
-        fallback_query = f'''
-            fields
-                id,
-                name,
-                first_release_date,
-                genres.name,
-                platforms.name,
-                cover.url;
-            {fallback_where}
-            limit {fetch_limit};
-        '''
-        results = _igdb_request(client_id=client_id, client_secret=client_secret, query=fallback_query)
+    fallback_where_parts = [f'name ~ *"{safe_query}"*']
+    if platform_clause:
+        fallback_where_parts.append(platform_clause)
+    queries.append(("games", "fallback", f"fields {_SEARCH_FIELDS}; where {' & '.join(fallback_where_parts)}; limit {fetch_limit};"))
 
     # Fallback robuste: si le filtre par IDs de plateforme a été trop strict
     # (mauvais mapping IGDB possible), on relance en large puis on filtre localement.
+    if platform:
+        queries.append(("games", "broad", f'fields {_SEARCH_FIELDS}; search "{safe_query}"; limit {max(fetch_limit, 80)};'))
+
+    # Les variantes partent ensemble (un seul aller-retour); on garde la
+    # première non vide dans l'ordre de préférence.
+    variants = _igdb_multiquery(client_id=client_id, client_secret=client_secret, queries=queries, priority=priority)
+    fetched_at = time.time()
+    results = variants.get("main") or variants.get("fallback") or []
+
     if not results and platform:
-        broad_query = f'''
-            fields
-                id,
-                name,
-                first_release_date,
-                genres.name,
-                platforms.name,
-                cover.url;
-            search "{safe_query}";
-            limit {max(fetch_limit, 80)};
-        '''
-        broad_results = _igdb_request(client_id=client_id, client_secret=client_secret, query=broad_query)
-        normalized_broad = [_normalize_game_item(item) for item in broad_results]
+        normalized_broad = [_normalize_game_item(item) for item in variants.get("broad") or []]
         filtered_broad = _filter_results_by_platform(normalized_broad, platform)
-        return _finalize_results(filtered_broad, query, page_size)
+        return {
+            "results": _finalize_results(filtered_broad, query, page_size),
+            "candidates": [],
+            "complete": False,
+            "fetched_at": fetched_at,
+        }
 
     normalized = [_normalize_game_item(item) for item in results]
     filtered = _filter_results_by_platform(normalized, platform)
-    return _finalize_results(filtered, query, page_size)
 
+    # Sous la limite, la requête par sous-chaîne a renvoyé toutes les
+    # correspondances: les requêtes plus longues peuvent être filtrées localement.
+    substring_matches = variants.get("fallback") or []
+    complete = len(substring_matches) < fetch_limit
+    candidates: list[dict[str, Any]] = []
+    if complete:
+        candidates = _filter_results_by_platform([_normalize_game_item(item) for item in substring_matches], platform)
 
-def game_details(client_id: str, client_secret: str, igdb_id: int, include_french_summary: bool = True) -> dict[str, Any]:
-    if not client_id or not client_secret:
-        raise ValueError("IGDB_CLIENT_ID ou IGDB_CLIENT_SECRET manquant.")
-
-    igdb_query = f'''
-        fields
-            id,
-            name,
-            first_release_date,
-            genres.name,
-            platforms.name,
-            cover.url,
-            artworks.url,
-            screenshots.url,
-            summary,
-            videos.name,
-            videos.video_id,
-            involved_companies.publisher,
-            involved_companies.company.name;
-        where id = {igdb_id};
-        limit 1;
-    '''
-
-    results = _igdb_request(client_id=client_id, client_secret=client_secret, query=igdb_query)
-
-    if not results:
-        raise ValueError("Jeu introuvable sur IGDB.")
+    return {
+        "results": _finalize_results(filtered, query, page_size),
+        "candidates": candidates,
+        "complete": complete,
+        "fetched_at": fetched_at,
+    }
 
-    item = results[0]
 
+def _normalize_details_item(item: dict[str, Any], description_fr: str | None) -> dict[str, Any]:
     release_date = _format_date(item.get("first_release_date"))
-    description_fr = _fetch_french_summary(item.get("name") or "") if include_french_summary else None
-
     return {
         "igdb_id": item.get("id"),
         "title": item.get("name"),
@@ -516,3 +1012,97 @@ def game_details(client_id: str, client_secret: str, igdb_id: int, include_frenc
         "images": _collect_gallery_images(item),
         "videos": _extract_videos(item),
     }
+
+
+def game_details_many(
+    client_id: str,
+    client_secret: str,
+    igdb_ids: list[int],
+    include_french_summary: bool = False,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> dict[int, dict[str, Any]]:
+    """Détails de plusieurs jeux en un minimum d'allers-retours.
+
+    Les ids sont regroupés par `where id = (...)` (500 max par requête) et
+    jusqu'à 10 requêtes partent dans un même multiquery. Les ids inconnus
+    d'IGDB sont absents du résultat.
+    """
+    if not client_id or not client_secret:
+        raise ValueError("IGDB_CLIENT_ID ou IGDB_CLIENT_SECRET manquant.")
+
+    unique_ids = list(dict.fromkeys(int(igdb_id) for igdb_id in igdb_ids))
+    chunks = [unique_ids[i : i + IGDB_MAX_LIMIT] for i in range(0, len(unique_ids), IGDB_MAX_LIMIT)]
+
+    items: list[dict[str, Any]] = []
+    for start in range(0, len(chunks), IGDB_MULTIQUERY_MAX_QUERIES):
+        queries = [
+            (
+                "games",
+                f"details_{index}",
+                f"fields {_DETAILS_FIELDS}; where id = ({','.join(str(i) for i in chunk)}); limit {len(chunk)};",
+            )
+            for index, chunk in enumerate(chunks[start : start + IGDB_MULTIQUERY_MAX_QUERIES])
+        ]
+        results = _igdb_multiquery(client_id=client_id, client_secret=client_secret, queries=queries, priority=priority)
+        for rows in results.values():
+            items.extend(rows)
+
+    summaries: dict[str, str | None] = {}
+    if include_french_summary:
+        if len(items) == 1:
+            name = items[0].get("name") or ""
+            summaries = {name: _fetch_french_summary(name)}
+        else:
+            summaries = fetch_french_summaries([item.get("name") or "" for item in items])
+
+    details: dict[int, dict[str, Any]] = {}
+    for item in items:
+        igdb_id = item.get("id")
+        if not isinstance(igdb_id, int):
+            continue
+        details[igdb_id] = _normalize_details_item(item, summaries.get(item.get("name") or ""))
+    return details
+
+
+def _game_details_key(
+    client_id: str,
+    client_secret: str,
+    igdb_id: int,
+    include_french_summary: bool = True,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> tuple:
+    return client_id, int(igdb_id), include_french_summary
+
+
+@single_flight(_game_details_key)
+def game_details(
+    client_id: str,
+    client_secret: str,
+    igdb_id: int,
+    include_french_summary: bool = True,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> dict[str, Any]:
+    if not client_id or not client_secret:
+        raise ValueError("IGDB_CLIENT_ID ou IGDB_CLIENT_SECRET manquant.")
+
+    details = game_details_many(
+        client_id=client_id,
+        client_secret=client_secret,
+        igdb_ids=[igdb_id],
+        include_french_summary=include_french_summary,
+        priority=priority,
+    )
+
+    if igdb_id not in details:
+        raise ValueError("Jeu introuvable sur IGDB.")
+
+    return details[igdb_id]
+
+
+def metadata_cache_stats() -> dict[str, dict[str, int]]:
+    return {
+        "twitch_token": _token_cache.stats(),
+        "french_summaries": _french_summary_cache.stats(),
+        "platform_ids": _platform_id_cache.stats(),
+        "search_results": _search_results_cache.stats(),
+    }
@@ -1,10 +1,22 @@
 from datetime import datetime
-import json
+
+from sqlalchemy.dialects.postgresql import JSONB
+
 from .extensions import db
 
 
 class Game(db.Model):
     __tablename__ = "games"
+    # Chemins d'accès de /api/games (filtre éventuel puis tri/pagination
+    # sur (title, id)) et de /api/platforms (DISTINCT platform trié). Créés
+    # par la migration 5: les déclarer ici ne sert qu'à documenter le modèle.
+    # Les index des autres tris et de la recherche par titre (expressions,
+    # trigrammes) ne sont créés que par la migration 6.
+    __table_args__ = (
+        db.Index("ix_games_title_id", "title", "id"),
+        db.Index("ix_games_platform_title_id", "platform", "title", "id"),
+        db.Index("ix_games_completed_title_id", "completed", "title", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -19,19 +31,30 @@ class Game(db.Model):
 
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
-    def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "title": self.title,
-            "platform": self.platform,
-            "completed": self.completed,
-            "ownership_type": self.ownership_type,
-            "genre": self.genre,
-            "release_date": self.release_date,
-            "cover_url": self.cover_url,
-            "description": self.description,
-            "created_at": self.created_at.isoformat(),
-        }
+    # Champs exposés par l'API, dans l'ordre de sérialisation.
+    PUBLIC_FIELDS = (
+        "id",
+        "title",
+        "platform",
+        "completed",
+        "ownership_type",
+        "genre",
+        "release_date",
+        "cover_url",
+        "description",
+        "created_at",
+    )
+
+    def to_dict(self, fields: tuple[str, ...] | None = None) -> dict:
+        # N'accède qu'aux champs demandés: une colonne différée (load_only)
+        # ne doit pas être rechargée ligne par ligne.
+        data = {}
+        for name in fields or self.PUBLIC_FIELDS:
+            value = getattr(self, name)
+            if name == "created_at":
+                value = value.isoformat()
+            data[name] = value
+        return data
 
 
 class GameSheetCache(db.Model):
@@ -47,28 +70,99 @@ class GameSheetCache(db.Model):
     release_year = db.Column(db.Integer, nullable=True)
     publisher = db.Column(db.String(255), nullable=True)
     cover_url = db.Column(db.String(512), nullable=True)
-    description = db.Column(db.Text, nullable=True)
-    description_fr = db.Column(db.Text, nullable=True)
-    images_json = db.Column(db.Text, nullable=True)
-    videos_json = db.Column(db.Text, nullable=True)
+    # Chargés à la demande: une fiche servie depuis le cache n'utilise que payload_json.
+    description = db.deferred(db.Column(db.Text, nullable=True))
+    description_fr = db.deferred(db.Column(db.Text, nullable=True))
+    images = db.deferred(db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=True))
+    videos = db.deferred(db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=True))
+    # Partie distante de la fiche, déjà encodée en JSON, et champs laissés
+    # vides par IGDB que le jeu local complète à la lecture.
+    payload_json = db.Column(db.Text, nullable=True)
+    overlay_fields = db.Column(db.String(255), nullable=False, default="")
     cached_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
-    def set_images(self, images: list[str]) -> None:
-        self.images_json = json.dumps(images or [])
-
-    def get_images(self) -> list[str]:
-        try:
-            data = json.loads(self.images_json or "[]")
-            return data if isinstance(data, list) else []
-        except Exception:
-            return []
-
-    def set_videos(self, videos: list[dict]) -> None:
-        self.videos_json = json.dumps(videos or [])
-
-    def get_videos(self) -> list[dict]:
-        try:
-            data = json.loads(self.videos_json or "[]")
-            return data if isinstance(data, list) else []
-        except Exception:
-            return []
+
+class CollectionState(db.Model):
+    __tablename__ = "collection_state"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class MetadataCache(db.Model):
+    __tablename__ = "metadata_cache"
+
+    key = db.Column(db.String(255), primary_key=True)
+    value = db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class IgdbGame(db.Model):
+    """Copie locale des résultats de recherche IGDB (id = id IGDB)."""
+
+    __tablename__ = "igdb_games"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(255), nullable=False)
+    # Titre normalisé, indexé en trigrammes (pg_trgm) pour la recherche locale.
+    normalized_title = db.Column(db.String(255), nullable=False, index=True)
+    release_date = db.Column(db.String(50), nullable=True)
+    cover_url = db.Column(db.String(512), nullable=True)
+    genres = db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    platforms = db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_search_result(self) -> dict:
+        # Même forme que les résultats de `igdb.search_games`.
+        return {
+            "igdb_id": self.id,
+            "title": self.title,
+            "release_date": self.release_date,
+            "cover_url": self.cover_url,
+            "genres": self.genres or [],
+            "platforms": self.platforms or [],
+        }
+
+
+class IgdbPlatform(db.Model):
+    __tablename__ = "igdb_platforms"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(255), nullable=False)
+    alternative_name = db.Column(db.String(255), nullable=True)
+    normalized_name = db.Column(db.String(255), nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class GameIgdbMatch(db.Model):
+    """Correspondance retenue entre un jeu de la collection et une entrée IGDB."""
+
+    __tablename__ = "game_igdb_matches"
+
+    game_id = db.Column(db.Integer, db.ForeignKey("games.id", ondelete="CASCADE"), primary_key=True)
+    igdb_id = db.Column(db.Integer, nullable=False)
+    # Empreinte titre/plateforme au moment du choix: la décision est caduque si elle change.
+    source_fingerprint = db.Column(db.String(128), nullable=False)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    matched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class JobCheckpoint(db.Model):
+    """Avancement persistant d'une tâche longue (reprise après interruption)."""
+
+    __tablename__ = "job_checkpoints"
+
+    name = db.Column(db.String(64), primary_key=True)
+    state = db.Column(db.JSON().with_variant(JSONB(), "postgresql"), nullable=False, default=dict)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class SchemaMigration(db.Model):
+    """Étapes de migration appliquées (voir `db_init.MIGRATIONS`)."""
+
+    __tablename__ = "schema_migrations"
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(255), nullable=False)
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
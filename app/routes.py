@@ -1,33 +1,103 @@
-from flask import Blueprint, current_app, jsonify, render_template, request
-from sqlalchemy import asc
-import re
+import json
+import math
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, render_template, request, stream_with_context
+from sqlalchemy.orm import load_only
 
 from .constants import (
-    DEFAULT_OWNERSHIP_TYPE,
+    DEFAULT_EVENT_STREAM_MAX_SUBSCRIBERS,
+    DEFAULT_GAMES_PAGE_SIZE,
     DEFAULT_SHEET_CACHE_TTL_SECONDS,
-    VALID_OWNERSHIP_TYPES,
+    EVENT_STREAM_KEEPALIVE_SECONDS,
+    EVENT_STREAM_MAX_DURATION_SECONDS,
+    MAX_GAMES_PAGE_SIZE,
+    MAX_SHEET_WAIT_SECONDS,
+    SHEETS_BATCH_MAX_IDS,
 )
 from .extensions import db
 from .models import Game
-from .igdb import game_details, search_games
-from .services.metadata_service import pick_best_match
+from .igdb import IgdbBudgetExceeded, game_details, metadata_cache_stats
+from .services.collection_service import (
+    DEFAULT_GAME_SORT,
+    GAME_SORTS,
+    build_collection_etag,
+    bump_collection_version,
+    collection_summary,
+    filter_games,
+    get_collection_version,
+    list_platform_names,
+    paginate_games,
+)
+from .services.game_service import (
+    build_game_changes,
+    build_new_game_values,
+    bulk_delete_games,
+    bulk_update_games,
+    parse_bulk_selector,
+)
+from .services.export_service import EXPORT_FORMATS, iter_export_csv, iter_export_ndjson
+from .services.import_service import detect_import_format, import_games, iter_import_rows
 from .services.game_sheet_service import (
     build_sheet_fallback_payload,
-    build_sheet_payload_from_cache,
-    get_valid_sheet_cache,
+    encode_sheet_from_cache,
+    get_cached_sheet_payloads,
+    get_sheet_cache,
     invalidate_sheet_cache,
-    upsert_sheet_cache,
+    sheet_source_changed,
+)
+from .services.igdb_mirror_service import record_igdb_games, search_metadata
+from .services.invalidation_service import EventSubscription
+from .services.matching_service import pick_best_match
+from .services.sheet_builder import (
+    schedule_sheet_build,
+    schedule_sheet_builds,
+    wait_for_sheet_build,
 )
 
 
 main_bp = Blueprint("main", __name__)
 
+IGDB_BUSY_MESSAGE = "IGDB est très sollicité, réessaie dans quelques secondes."
+
+
+def _parse_page_size(value: str | None) -> int:
+    try:
+        limit = int(value) if value else DEFAULT_GAMES_PAGE_SIZE
+    except ValueError:
+        raise ValueError("Le paramètre limit doit être un entier.")
+    if limit < 1:
+        raise ValueError("Le paramètre limit doit être positif.")
+    return min(limit, MAX_GAMES_PAGE_SIZE)
 
-def _normalize_ownership_type(value: str | None) -> str:
-    candidate = (value or "").strip().lower()
-    if candidate in VALID_OWNERSHIP_TYPES:
-        return candidate
-    return DEFAULT_OWNERSHIP_TYPE
+
+def _parse_fields(value: str | None) -> tuple[str, ...] | None:
+    if not value:
+        return None
+
+    requested = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in Game.PUBLIC_FIELDS]
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+
+    # `id` est toujours renvoyé pour que le client puisse adresser la ligne.
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def _parse_id_list(value: str | None, max_ids: int) -> list[int]:
+    try:
+        ids = [int(part) for part in (value or "").split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("Le paramètre ids attend des entiers séparés par des virgules.")
+    if not ids:
+        raise ValueError("Le paramètre ids est obligatoire.")
+    if len(ids) > max_ids:
+        raise ValueError(f"Au plus {max_ids} ids par requête.")
+    return list(dict.fromkeys(ids))
+
+
+def _get_sheet_ttl_seconds() -> int:
+    return int(current_app.config.get("SHEET_CACHE_TTL_SECONDS", DEFAULT_SHEET_CACHE_TTL_SECONDS))
 
 
 def _get_igdb_credentials() -> tuple[str, str]:
@@ -43,88 +113,156 @@ def index():
 
 @main_bp.route("/api/games", methods=["GET"])
 def list_games():
-    platform = request.args.get("platform")
+    # Plusieurs `platform`: alias d'une même console regroupés par le client.
+    platforms = [value for value in request.args.getlist("platform") if value]
     completed = request.args.get("completed")
+    title_search = (request.args.get("q") or "").strip()
+    sort = request.args.get("sort") or DEFAULT_GAME_SORT
+    if sort not in GAME_SORTS:
+        return jsonify({"error": f"Tri inconnu: {sort}"}), 400
 
-    query = Game.query
+    try:
+        fields = _parse_fields(request.args.get("fields"))
+        # Toujours paginé: une page bornée, jamais la table entière.
+        limit = _parse_page_size(request.args.get("limit"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
-    if platform:
-        query = query.filter(Game.platform == platform)
+    # Une seule requête légère suffit à répondre 304 si rien n'a changé.
+    etag = build_collection_etag(get_collection_version(), request.args.to_dict(flat=False))
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
-    if completed in {"true", "false"}:
-        query = query.filter(Game.completed == (completed == "true"))
+    query = Game.query
+    if fields:
+        # Les colonnes du tri restent chargées: le curseur de pagination en dépend.
+        loaded = dict.fromkeys([*(name for name, _ in GAME_SORTS[sort]), *fields])
+        query = query.options(load_only(*(getattr(Game, name) for name in loaded)))
+
+    query = filter_games(
+        query,
+        platform=platforms if len(platforms) > 1 else (platforms[0] if platforms else None),
+        completed=(completed == "true") if completed in {"true", "false"} else None,
+        title_search=title_search,
+    )
 
-    games = query.order_by(asc(Game.title)).all()
-    return jsonify([g.to_dict() for g in games])
+    try:
+        games, next_cursor = paginate_games(query, limit=limit, after=request.args.get("after"), sort=sort)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    response = jsonify({"items": [g.to_dict(fields) for g in games], "next_cursor": next_cursor})
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @main_bp.route("/api/games", methods=["POST"])
 def create_game():
     payload = request.get_json(force=True)
 
-    title = (payload.get("title") or "").strip()
-    platform = (payload.get("platform") or "").strip()
-    completed = bool(payload.get("completed", False))
-    ownership_type = _normalize_ownership_type(payload.get("ownership_type"))
-
-    if not title:
-        return jsonify({"error": "Le titre est obligatoire."}), 400
-    if not platform:
-        return jsonify({"error": "La plateforme est obligatoire."}), 400
-
-    game = Game(
-        title=title,
-        platform=platform,
-        completed=completed,
-        ownership_type=ownership_type,
-        genre=payload.get("genre"),
-        release_date=payload.get("release_date"),
-        cover_url=payload.get("cover_url"),
-        description=payload.get("description"),
-    )
+    try:
+        game = Game(**build_new_game_values(payload))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
     db.session.add(game)
+    bump_collection_version()
     db.session.commit()
 
     return jsonify(game.to_dict()), 201
 
 
-@main_bp.route("/api/games/<int:game_id>", methods=["PATCH"])
-def update_game(game_id: int):
-    game = Game.query.get_or_404(game_id)
+@main_bp.route("/api/games/import", methods=["POST"])
+def import_collection():
+    try:
+        fmt = detect_import_format(request.args.get("format"), request.mimetype)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    report = import_games(iter_import_rows(request.stream, fmt))
+    return jsonify(report)
+
+
+@main_bp.route("/api/games/export", methods=["GET"])
+def export_collection():
+    fmt = (request.args.get("format") or "ndjson").strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "Format d'export attendu: ndjson ou csv."}), 400
+
+    platform = request.args.get("platform") or None
+    completed_arg = request.args.get("completed")
+    completed = (completed_arg == "true") if completed_arg in {"true", "false"} else None
+
+    iter_export = iter_export_csv if fmt == "csv" else iter_export_ndjson
+    response = current_app.response_class(
+        stream_with_context(iter_export(platform=platform, completed=completed)),
+        mimetype=EXPORT_FORMATS[fmt],
+    )
+    response.headers["Content-Disposition"] = f'attachment; filename="ludotheque.{fmt}"'
+    return response
+
+
+@main_bp.route("/api/games/bulk", methods=["PATCH"])
+def bulk_update():
+    payload = request.get_json(force=True)
+
+    try:
+        ids, platform = parse_bulk_selector(payload)
+        raw_changes = payload.get("changes") or {}
+        if not isinstance(raw_changes, dict):
+            raise ValueError("Le champ changes doit être un objet JSON.")
+        changes = build_game_changes(raw_changes)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    if not changes:
+        return jsonify({"error": "Aucune modification demandée."}), 400
+
+    updated = bulk_update_games(ids=ids, platform=platform, changes=changes)
+    return jsonify({"updated": updated})
+
+
+@main_bp.route("/api/games/bulk", methods=["DELETE"])
+def bulk_delete():
     payload = request.get_json(force=True)
 
-    if "completed" in payload:
-        game.completed = bool(payload["completed"])
+    try:
+        ids, platform = parse_bulk_selector(payload)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
-    if "platform" in payload and payload["platform"]:
-        game.platform = payload["platform"].strip()
+    deleted = bulk_delete_games(ids=ids, platform=platform)
+    return jsonify({"deleted": deleted})
 
-    if "ownership_type" in payload:
-        game.ownership_type = _normalize_ownership_type(payload.get("ownership_type"))
 
-    if "title" in payload:
-        title = (payload.get("title") or "").strip()
-        if not title:
-            return jsonify({"error": "Le titre est obligatoire."}), 400
-        game.title = title
+@main_bp.route("/api/games/<int:game_id>", methods=["GET"])
+def get_game(game_id: int):
+    game = Game.query.get_or_404(game_id)
+    return jsonify(game.to_dict())
 
-    if "genre" in payload:
-        game.genre = (payload.get("genre") or "").strip() or None
 
-    if "release_date" in payload:
-        release_date = (payload.get("release_date") or "").strip()
-        if release_date and not re.match(r"^\d{4}-\d{2}-\d{2}$", release_date):
-            return jsonify({"error": "Date attendue: YYYY-MM-DD"}), 400
-        game.release_date = release_date or None
+@main_bp.route("/api/games/<int:game_id>", methods=["PATCH"])
+def update_game(game_id: int):
+    game = Game.query.get_or_404(game_id)
+    payload = request.get_json(force=True)
 
-    if "cover_url" in payload:
-        game.cover_url = (payload.get("cover_url") or "").strip() or None
+    try:
+        changes = build_game_changes(payload)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
-    if "description" in payload:
-        game.description = (payload.get("description") or "").strip() or None
+    # Les champs purement locaux (terminé, format...) sont superposés à la
+    # lecture: inutile de jeter les métadonnées IGDB en cache.
+    if sheet_source_changed(game, changes):
+        invalidate_sheet_cache(game.id)
 
-    invalidate_sheet_cache(game.id)
+    for name, value in changes.items():
+        setattr(game, name, value)
+
+    bump_collection_version()
 
     db.session.commit()
     return jsonify(game.to_dict())
@@ -135,20 +273,14 @@ def delete_game(game_id: int):
     game = Game.query.get_or_404(game_id)
     invalidate_sheet_cache(game.id)
     db.session.delete(game)
+    bump_collection_version()
     db.session.commit()
     return "", 204
 
 
 @main_bp.route("/api/platforms", methods=["GET"])
 def list_platforms():
-    platforms = [
-        row[0]
-        for row in db.session.query(Game.platform)
-        .distinct()
-        .order_by(asc(Game.platform))
-        .all()
-    ]
-    return jsonify(platforms)
+    return jsonify(list_platform_names())
 
 
 @main_bp.route("/api/metadata/search", methods=["GET"])
@@ -161,23 +293,33 @@ def metadata_search():
     client_id, client_secret = _get_igdb_credentials()
 
     try:
-        results = search_games(client_id=client_id, client_secret=client_secret, query=query, platform=platform)
+        results = search_metadata(client_id=client_id, client_secret=client_secret, query=query, platform=platform)
         return jsonify(results)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
+    except IgdbBudgetExceeded:
+        return jsonify({"error": IGDB_BUSY_MESSAGE}), 503
     except Exception as exc:
         return jsonify({"error": f"Impossible de récupérer les métadonnées: {str(exc)}"}), 502
 
 
+@main_bp.route("/api/metadata/cache-stats", methods=["GET"])
+def metadata_cache_statistics():
+    return jsonify(metadata_cache_stats())
+
+
 @main_bp.route("/api/metadata/details/<int:igdb_id>", methods=["GET"])
 def metadata_details(igdb_id: int):
     client_id, client_secret = _get_igdb_credentials()
 
     try:
         result = game_details(client_id=client_id, client_secret=client_secret, igdb_id=igdb_id)
+        record_igdb_games([result])
         return jsonify(result)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
+    except IgdbBudgetExceeded:
+        return jsonify({"error": IGDB_BUSY_MESSAGE}), 503
     except Exception as exc:
         return jsonify({"error": f"Impossible de récupérer le détail du jeu: {str(exc)}"}), 502
 
@@ -193,7 +335,7 @@ def metadata_by_title():
     client_id, client_secret = _get_igdb_credentials()
 
     try:
-        results = search_games(client_id=client_id, client_secret=client_secret, query=title, page_size=10)
+        results = search_metadata(client_id=client_id, client_secret=client_secret, query=title, page_size=10)
         best_match = pick_best_match(results=results, title=title, platform=platform)
 
         if not best_match:
@@ -204,61 +346,141 @@ def metadata_by_title():
             return jsonify({"error": "Résultat IGDB invalide."}), 502
 
         details = game_details(client_id=client_id, client_secret=client_secret, igdb_id=int(igdb_id))
+        record_igdb_games([details])
         return jsonify(details)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
+    except IgdbBudgetExceeded:
+        return jsonify({"error": IGDB_BUSY_MESSAGE}), 503
     except Exception as exc:
         return jsonify({"error": f"Impossible de charger la fiche du jeu: {str(exc)}"}), 502
 
 
+@main_bp.route("/api/games/sheets", methods=["GET"])
+def game_sheets():
+    try:
+        game_ids = _parse_id_list(request.args.get("ids"), SHEETS_BATCH_MAX_IDS)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    payloads, misses, stale = get_cached_sheet_payloads(game_ids, ttl_seconds=_get_sheet_ttl_seconds())
+
+    client_id, client_secret = _get_igdb_credentials()
+    if client_id and client_secret:
+        schedule_sheet_builds([*misses, *stale])
+    else:
+        misses = []
+
+    # Fiches déjà encodées: la réponse est assemblée sans les redécoder.
+    sheets_json = ",".join(f'"{game_id}":{payload}' for game_id, payload in payloads.items())
+    return _json_response(f'{{"sheets":{{{sheets_json}}},"pending":{json.dumps(misses)}}}')
+
+
 @main_bp.route("/api/games/<int:game_id>/sheet", methods=["GET"])
 def game_sheet(game_id: int):
     game = Game.query.get_or_404(game_id)
 
     client_id, client_secret = _get_igdb_credentials()
-    ttl_seconds = int(current_app.config.get("SHEET_CACHE_TTL_SECONDS", DEFAULT_SHEET_CACHE_TTL_SECONDS))
+    ttl_seconds = _get_sheet_ttl_seconds()
 
-    cache_row, fingerprint = get_valid_sheet_cache(game=game, ttl_seconds=ttl_seconds)
-    fallback_payload = build_sheet_fallback_payload(game)
+    cache_row, stale = get_sheet_cache(game=game, ttl_seconds=ttl_seconds)
     if cache_row:
-        return jsonify(build_sheet_payload_from_cache(game, cache_row))
+        # Stale-while-revalidate: la fiche expirée est servie telle quelle.
+        if stale and client_id and client_secret:
+            schedule_sheet_build(game.id)
+        return _json_response(encode_sheet_from_cache(game, cache_row))
 
+    fallback_payload = build_sheet_fallback_payload(game)
     if not client_id or not client_secret:
         return jsonify(fallback_payload)
 
+    # Réponse immédiate; la fiche enrichie arrive via /sheet/wait.
+    schedule_sheet_build(game.id)
+    return jsonify({**fallback_payload, "pending": True})
+
+
+@main_bp.route("/api/games/<int:game_id>/sheet/wait", methods=["GET"])
+def wait_game_sheet(game_id: int):
     try:
-        results = search_games(client_id=client_id, client_secret=client_secret, query=game.title, page_size=10)
-        best_match = pick_best_match(results=results, title=game.title, platform=game.platform)
-
-        if not best_match or not best_match.get("igdb_id"):
-            return jsonify(fallback_payload)
-
-        details = game_details(
-            client_id=client_id,
-            client_secret=client_secret,
-            igdb_id=int(best_match["igdb_id"]),
-            include_french_summary=False,
-        )
-
-        merged = {
-            "id": game.id,
-            "title": details.get("title") or game.title,
-            "platform": game.platform,
-            "completed": game.completed,
-            "ownership_type": game.ownership_type,
-            "release_date": details.get("release_date") or game.release_date,
-            "release_year": details.get("release_year")
-            or (int(game.release_date[:4]) if game.release_date and len(game.release_date) >= 4 else None),
-            "publisher": details.get("publisher"),
-            "cover_url": details.get("cover_url") or game.cover_url,
-            "description_fr": details.get("description_fr"),
-            "description": details.get("description") or game.description,
-            "images": details.get("images") or ([game.cover_url] if game.cover_url else []),
-            "videos": details.get("videos") or [],
-        }
-
-        upsert_sheet_cache(game=game, fingerprint=fingerprint, payload=merged)
-
-        return jsonify(merged)
+        timeout = float(request.args.get("timeout") or MAX_SHEET_WAIT_SECONDS)
+    except ValueError:
+        timeout = math.nan
+    # nan traverserait le bornage min/max tel quel.
+    if not math.isfinite(timeout):
+        return jsonify({"error": "Le paramètre timeout doit être un nombre."}), 400
+
+    # Long-poll: rend la main dès que la construction en cours se termine.
+    wait_for_sheet_build(game_id, timeout=min(max(timeout, 0), MAX_SHEET_WAIT_SECONDS))
+
+    game = Game.query.get_or_404(game_id)
+    cache_row, _ = get_sheet_cache(game=game, ttl_seconds=_get_sheet_ttl_seconds())
+    if cache_row:
+        return _json_response(encode_sheet_from_cache(game, cache_row))
+
+    # La construction a pu être confiée à un autre worker: seule la base fait
+    # foi. Sans fiche en cache, le client repassera (attente courte, voir app.js).
+    client_id, client_secret = _get_igdb_credentials()
+    return jsonify({**build_sheet_fallback_payload(game), "pending": bool(client_id and client_secret)})
+
+
+def _json_response(body: str) -> Response:
+    return current_app.response_class(body, mimetype="application/json")
+
+
+def _format_sse(event_name: str, data: dict) -> str:
+    return f"event: {event_name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@main_bp.route("/api/collection/version", methods=["GET"])
+def collection_version():
+    # Repli des onglets sans flux /api/events: une lecture de clé primaire.
+    response = jsonify({"version": get_collection_version()})
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@main_bp.route("/api/collection/summary", methods=["GET"])
+def collection_summary_view():
+    # Accueil (tuiles de plateformes, compteurs): un agrégat, pas la collection.
+    etag = build_collection_etag(get_collection_version(), {"summary": True})
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(collection_summary())
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@main_bp.route("/api/events", methods=["GET"])
+def event_stream():
+    max_subscribers = int(current_app.config.get("EVENT_STREAM_MAX_SUBSCRIBERS", DEFAULT_EVENT_STREAM_MAX_SUBSCRIBERS))
+    # Abonnement avant la lecture de la version: aucun événement ne se perd entre les deux.
+    subscription = EventSubscription.open(max_subscribers)
+    if subscription is None:
+        return jsonify({"error": "Trop de flux d'événements ouverts, réessaie plus tard."}), 503
+    try:
+        version = get_collection_version()
     except Exception:
-        return jsonify(fallback_payload)
+        subscription.close()
+        raise
+
+    def generate():
+        try:
+            # Le client compare la version pour détecter ce qu'il a manqué hors connexion.
+            yield "retry: 3000\n" + _format_sse("hello", {"version": version})
+            # Flux borné dans le temps: le navigateur se reconnecte et le thread est libéré.
+            deadline = time.monotonic() + EVENT_STREAM_MAX_DURATION_SECONDS
+            while time.monotonic() < deadline:
+                event_data = subscription.get(timeout=EVENT_STREAM_KEEPALIVE_SECONDS)
+                if event_data is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_sse(event_data.get("type", "message"), event_data)
+        finally:
+            subscription.close()
+
+    response = current_app.response_class(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
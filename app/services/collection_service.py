@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+import hashlib
+import json
+from typing import Any
+
+from sqlalchemy import and_, asc, case, desc, func, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..extensions import db
+from ..models import CollectionState, Game
+from .invalidation_service import publish_collection_change
+
+
+COLLECTION_STATE_ID = 1
+
+
+def get_collection_version() -> int:
+    version = db.session.query(CollectionState.version).filter_by(id=COLLECTION_STATE_ID).scalar()
+    return int(version or 0)
+
+
+def _increment_collection_version() -> int:
+    return (
+        db.session.query(CollectionState)
+        .filter_by(id=COLLECTION_STATE_ID)
+        .update(
+            {
+                CollectionState.version: CollectionState.version + 1,
+                CollectionState.updated_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+    )
+
+
+def bump_collection_version() -> None:
+    """Incrémente la version de la collection dans la transaction courante.
+
+    À appeler avant le commit de toute écriture sur `games`: l'ETag des listes
+    en dépend.
+    """
+    if not _increment_collection_version():
+        if db.session.get_bind().dialect.name == "postgresql":
+            # Première écriture: deux threads peuvent créer la ligne en même
+            # temps. Le perdant attend le commit du gagnant puis incrémente.
+            db.session.execute(
+                pg_insert(CollectionState)
+                .values(id=COLLECTION_STATE_ID, version=0, updated_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=[CollectionState.id])
+            )
+            _increment_collection_version()
+        else:
+            # Hors PostgreSQL (SQLite), l'UPDATE verrouille déjà la base jusqu'au commit.
+            db.session.add(CollectionState(id=COLLECTION_STATE_ID, version=1))
+    publish_collection_change()
+
+
+def build_collection_etag(version: int, args: dict[str, Any]) -> str:
+    # Les paramètres font partie de l'ETag: deux pages/filtres différents
+    # ne doivent jamais partager la même validation.
+    raw = json.dumps(args, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    return f"{version}-{digest}"
+
+
+# Tris de `/api/games`: (colonne, décroissant) dans l'ordre, `id` en dernier
+# pour un ordre total. Le curseur de pagination contient les valeurs de ces
+# colonnes pour la dernière ligne renvoyée.
+GAME_SORTS: dict[str, tuple[tuple[str, bool], ...]] = {
+    "az": (("title", False), ("id", False)),
+    "za": (("title", True), ("id", True)),
+    "newest": (("release_date", True), ("id", True)),
+    "completed": (("completed", True), ("title", False), ("id", False)),
+}
+DEFAULT_GAME_SORT = "az"
+GAME_SORT_COLUMNS = frozenset(name for columns in GAME_SORTS.values() for name, _ in columns)
+
+_SORT_VALUE_TYPES = {"title": str, "id": int, "release_date": str, "completed": bool}
+
+
+def _sort_expression(name: str):
+    # Date absente triée comme la plus ancienne (index de la migration 6).
+    column = getattr(Game, name)
+    return func.coalesce(column, "") if name == "release_date" else column
+
+
+def _sort_value(game: Game, name: str) -> Any:
+    value = getattr(game, name)
+    return "" if value is None and name == "release_date" else value
+
+
+def encode_cursor(game: Game, sort: str = DEFAULT_GAME_SORT) -> str:
+    values = [_sort_value(game, name) for name, _ in GAME_SORTS[sort]]
+    raw = json.dumps(values, ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = DEFAULT_GAME_SORT) -> tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except Exception as exc:
+        raise ValueError("Curseur de pagination invalide.") from exc
+
+    columns = GAME_SORTS[sort]
+    # `type() is`: un booléen ne doit pas passer pour un id (et inversement).
+    if (
+        not isinstance(values, list)
+        or len(values) != len(columns)
+        or any(type(value) is not _SORT_VALUE_TYPES[name] for (name, _), value in zip(columns, values))
+    ):
+        raise ValueError("Curseur de pagination invalide.")
+    return tuple(values)
+
+
+def filter_games(
+    query,
+    platform: str | list[str] | None = None,
+    completed: bool | None = None,
+    title_search: str | None = None,
+):
+    """Filtres de `/api/games`. Plusieurs plateformes: alias d'une même console."""
+    if isinstance(platform, list):
+        query = query.filter(Game.platform.in_(platform))
+    elif platform:
+        query = query.filter(Game.platform == platform)
+    if completed is not None:
+        query = query.filter(Game.completed == completed)
+    if title_search:
+        # Index trigrammes sous PostgreSQL (migration 6).
+        query = query.filter(Game.title.icontains(title_search, autoescape=True))
+    return query
+
+
+def order_games(query, after: tuple[Any, ...] | None = None, sort: str = DEFAULT_GAME_SORT):
+    """Tri de la collection selon `sort`, à partir d'un curseur décodé."""
+    columns = GAME_SORTS[sort]
+    if after:
+        directions = {descending for _, descending in columns}
+        if len(directions) == 1:
+            # Même sens partout: comparaison de n-uplets, servie par l'index.
+            row = tuple_(*(_sort_expression(name) for name, _ in columns))
+            query = query.filter(row < tuple_(*after) if directions.pop() else row > tuple_(*after))
+        else:
+            # Sens mixtes: (a, b) après (x, y) <=> a après x, ou a = x et b après y.
+            clauses = []
+            for index, ((name, descending), raw_value) in enumerate(zip(columns, after)):
+                expression = _sort_expression(name)
+                # literal(): SQLAlchemy refuse `<`/`>` face à un booléen Python nu.
+                value = literal(raw_value)
+                equal = [
+                    _sort_expression(previous) == previous_value
+                    for (previous, _), previous_value in zip(columns[:index], after[:index])
+                ]
+                clauses.append(and_(*equal, expression < value if descending else expression > value))
+            query = query.filter(or_(*clauses))
+    return query.order_by(
+        *(desc(_sort_expression(name)) if descending else asc(_sort_expression(name)) for name, descending in columns)
+    )
+
+
+def platform_names_query():
+    return db.session.query(Game.platform).distinct().order_by(asc(Game.platform))
+
+
+def list_platform_names() -> list[str]:
+    return [row[0] for row in platform_names_query().all()]
+
+
+def paginate_games(
+    query,
+    limit: int,
+    after: str | None = None,
+    sort: str = DEFAULT_GAME_SORT,
+) -> tuple[list[Game], str | None]:
+    """Pagination par clé (keyset) sur les colonnes du tri.
+
+    Contrairement à OFFSET, le coût d'une page ne dépend pas de sa position
+    dans la collection.
+    """
+    rows = order_games(query, decode_cursor(after, sort) if after else None, sort).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    games = rows[:limit]
+    next_cursor = encode_cursor(games[-1], sort) if has_more and games else None
+    return games, next_cursor
+
+
+def collection_summary_query():
+    return (
+        db.session.query(
+            Game.platform,
+            func.count(Game.id),
+            func.sum(case((Game.completed.is_(True), 1), else_=0)),
+            func.max(Game.cover_url),
+        )
+        .group_by(Game.platform)
+        .order_by(asc(Game.platform))
+    )
+
+
+def collection_summary() -> dict[str, Any]:
+    """Compteurs par plateforme (et une jaquette), pour l'accueil sans charger la collection."""
+    rows = collection_summary_query().all()
+    platforms = [
+        {"platform": platform, "count": count, "completed": int(completed or 0), "cover_url": cover_url}
+        for platform, count, completed, cover_url in rows
+    ]
+    return {
+        "total": sum(entry["count"] for entry in platforms),
+        "completed": sum(entry["completed"] for entry in platforms),
+        "platforms": platforms,
+    }
@@ -0,0 +1,116 @@
+"""Enrichissement en masse des jeux incomplets (commande `flask enrich`).
+
+Un jeu est à enrichir s'il lui manque un champ de métadonnées ou sa fiche en
+cache. Les champs vides sont remplis depuis IGDB sans jamais écraser une
+saisie de l'utilisateur, et la fiche est mise en cache au passage.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import time
+from typing import Any
+
+from flask import Flask
+from sqlalchemy import exists, or_
+
+from ..constants import ENRICH_BUDGET_RETRIES
+from ..extensions import db
+from ..igdb import PRIORITY_BACKGROUND, IgdbBudgetExceeded
+from ..models import Game, GameSheetCache, JobCheckpoint
+from .collection_service import bump_collection_version
+from .game_sheet_service import build_remote_sheet_payloads, build_sheet_fingerprint, upsert_sheet_cache
+
+
+ENRICHABLE_FIELDS = ("genre", "cover_url", "release_date", "description")
+
+
+def _needs_enrichment():
+    missing_fields = [or_(getattr(Game, name).is_(None), getattr(Game, name) == "") for name in ENRICHABLE_FIELDS]
+    return or_(*missing_fields, ~exists().where(GameSheetCache.game_id == Game.id))
+
+
+def count_games_to_enrich(after_id: int = 0) -> int:
+    return Game.query.filter(Game.id > after_id, _needs_enrichment()).count()
+
+
+def find_games_to_enrich(after_id: int, limit: int) -> list[int]:
+    rows = (
+        db.session.query(Game.id)
+        .filter(Game.id > after_id, _needs_enrichment())
+        .order_by(Game.id)
+        .limit(limit)
+        .all()
+    )
+    return [game_id for (game_id,) in rows]
+
+
+def _missing_field_values(game: Game, remote: dict[str, Any]) -> dict[str, Any]:
+    values = {
+        "genre": ", ".join(remote.get("genres") or [])[:255],
+        "cover_url": remote.get("cover_url"),
+        "release_date": remote.get("release_date"),
+        "description": remote.get("description_fr") or remote.get("description"),
+    }
+    return {name: value for name, value in values.items() if value and not getattr(game, name)}
+
+
+def enrich_games(game_ids: list[int], client_id: str, client_secret: str) -> set[int]:
+    """Enrichit un lot de jeux. Renvoie les ids trouvés sur IGDB."""
+    games = Game.query.filter(Game.id.in_(game_ids)).all()
+    payloads = build_remote_sheet_payloads(games, client_id=client_id, client_secret=client_secret, priority=PRIORITY_BACKGROUND)
+
+    changed = False
+    for game in games:
+        if game.id not in payloads:
+            continue
+        for name, value in _missing_field_values(game, payloads[game.id]).items():
+            setattr(game, name, value)
+            changed = True
+    if changed:
+        bump_collection_version()
+    db.session.commit()
+
+    for game in games:
+        if game.id in payloads:
+            upsert_sheet_cache(game=game, fingerprint=build_sheet_fingerprint(game), payload=payloads[game.id])
+    return set(payloads)
+
+
+def run_enrich_batch(app: Flask, game_ids: list[int]) -> set[int]:
+    """`enrich_games` dans son propre contexte, pour un thread du pool.
+
+    Budget IGDB épuisé: le lot est retenté avec un délai croissant. Toute
+    autre erreur fait échouer le lot sans interrompre les autres.
+    """
+    with app.app_context():
+        for attempt in range(ENRICH_BUDGET_RETRIES + 1):
+            try:
+                return enrich_games(
+                    game_ids,
+                    client_id=app.config.get("IGDB_CLIENT_ID", ""),
+                    client_secret=app.config.get("IGDB_CLIENT_SECRET", ""),
+                )
+            except IgdbBudgetExceeded:
+                db.session.rollback()
+                time.sleep(2**attempt)
+            except Exception:
+                db.session.rollback()
+                app.logger.warning("Enrichissement des jeux %s impossible.", game_ids, exc_info=True)
+                return set()
+    return set()
+
+
+def load_checkpoint(name: str) -> dict[str, Any]:
+    row = db.session.get(JobCheckpoint, name)
+    return dict(row.state or {}) if row else {}
+
+
+def save_checkpoint(name: str, state: dict[str, Any]) -> None:
+    db.session.merge(JobCheckpoint(name=name, state=state, updated_at=datetime.utcnow()))
+    db.session.commit()
+
+
+def clear_checkpoint(name: str) -> None:
+    JobCheckpoint.query.filter_by(name=name).delete()
+    db.session.commit()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Iterator
+
+from sqlalchemy import select
+
+from ..constants import EXPORT_CHUNK_SIZE
+from ..extensions import db
+from ..models import Game
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _iter_game_rows(platform: str | None = None, completed: bool | None = None) -> Iterator[dict[str, Any]]:
+    # Lignes brutes (pas d'objets ORM) lues par paquets via un curseur côté
+    # serveur: la mémoire reste constante quelle que soit la taille de la table.
+    columns = [getattr(Game, name) for name in Game.PUBLIC_FIELDS]
+    statement = select(*columns).order_by(Game.id)
+    if platform:
+        statement = statement.where(Game.platform == platform)
+    if completed is not None:
+        statement = statement.where(Game.completed == completed)
+
+    result = db.session.execute(statement.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+    for row in result:
+        data = dict(zip(Game.PUBLIC_FIELDS, row))
+        data["created_at"] = data["created_at"].isoformat() if data["created_at"] else None
+        yield data
+
+
+def iter_export_ndjson(platform: str | None = None, completed: bool | None = None) -> Iterator[str]:
+    chunk: list[str] = []
+    for data in _iter_game_rows(platform=platform, completed=completed):
+        chunk.append(json.dumps(data, ensure_ascii=False))
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk.clear()
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def iter_export_csv(platform: str | None = None, completed: bool | None = None) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=Game.PUBLIC_FIELDS)
+    writer.writeheader()
+
+    # Le premier morceau (en-tête) part immédiatement.
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for data in _iter_game_rows(platform=platform, completed=completed):
+        # "true"/"false" pour rester relisible par l'import CSV.
+        data["completed"] = "true" if data["completed"] else "false"
+        writer.writerow(data)
+        pending += 1
+        if pending >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if pending:
+        yield buffer.getvalue()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from sqlalchemy import delete, select, update
+
+from ..constants import BULK_MAX_IDS, DEFAULT_OWNERSHIP_TYPE, VALID_OWNERSHIP_TYPES
+from ..extensions import db
+from ..models import Game
+from .collection_service import bump_collection_version
+from .game_sheet_service import SHEET_SOURCE_FIELDS, invalidate_sheet_caches
+
+
+def normalize_ownership_type(value: str | None) -> str:
+    candidate = _text_value({"ownership_type": value}, "ownership_type").lower()
+    if candidate in VALID_OWNERSHIP_TYPES:
+        return candidate
+    return DEFAULT_OWNERSHIP_TYPE
+
+
+def _text_value(payload: dict[str, Any], name: str) -> str:
+    """Champ texte nettoyé ("" si absent). Refuse les autres types et les valeurs trop longues."""
+    value = payload.get(name)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"Le champ {name} doit être une chaîne de caractères.")
+    value = value.strip()
+    column = Game.__table__.columns.get(name)
+    max_length = getattr(column.type, "length", None) if column is not None else None
+    if max_length and len(value) > max_length:
+        raise ValueError(f"Le champ {name} dépasse {max_length} caractères.")
+    return value
+
+
+def _completed_value(payload: dict[str, Any]) -> bool:
+    value = payload.get("completed")
+    if value is None:
+        return False
+    if not isinstance(value, bool):
+        raise ValueError("Le champ completed doit valoir true ou false.")
+    return value
+
+
+def build_new_game_values(payload: dict[str, Any]) -> dict[str, Any]:
+    """Valide un payload de création et renvoie les colonnes de `games`.
+
+    Lève `ValueError` avec un message destiné à l'utilisateur.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Objet JSON attendu.")
+    title = _text_value(payload, "title")
+    platform = _text_value(payload, "platform")
+
+    if not title:
+        raise ValueError("Le titre est obligatoire.")
+    if not platform:
+        raise ValueError("La plateforme est obligatoire.")
+
+    return {
+        "title": title,
+        "platform": platform,
+        "completed": _completed_value(payload),
+        "ownership_type": normalize_ownership_type(payload.get("ownership_type")),
+        "genre": _text_value(payload, "genre") or None,
+        "release_date": _text_value(payload, "release_date") or None,
+        "cover_url": _text_value(payload, "cover_url") or None,
+        "description": _text_value(payload, "description") or None,
+    }
+
+
+def build_game_changes(payload: dict[str, Any]) -> dict[str, Any]:
+    """Valide un payload de modification partielle.
+
+    Seules les clés présentes dans le payload sont renvoyées. Lève
+    `ValueError` avec un message destiné à l'utilisateur.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Objet JSON attendu.")
+    changes: dict[str, Any] = {}
+
+    if "completed" in payload:
+        changes["completed"] = _completed_value(payload)
+
+    if "platform" in payload and payload["platform"]:
+        changes["platform"] = _text_value(payload, "platform")
+
+    if "ownership_type" in payload:
+        changes["ownership_type"] = normalize_ownership_type(payload.get("ownership_type"))
+
+    if "title" in payload:
+        title = _text_value(payload, "title")
+        if not title:
+            raise ValueError("Le titre est obligatoire.")
+        changes["title"] = title
+
+    if "genre" in payload:
+        changes["genre"] = _text_value(payload, "genre") or None
+
+    if "release_date" in payload:
+        release_date = _text_value(payload, "release_date")
+        if release_date and not re.match(r"^\d{4}-\d{2}-\d{2}$", release_date):
+            raise ValueError("Date attendue: YYYY-MM-DD")
+        changes["release_date"] = release_date or None
+
+    if "cover_url" in payload:
+        changes["cover_url"] = _text_value(payload, "cover_url") or None
+
+    if "description" in payload:
+        changes["description"] = _text_value(payload, "description") or None
+
+    return changes
+
+
+def parse_bulk_selector(payload: Any) -> tuple[list[int], str | None]:
+    """Lit la sélection d'une opération groupée: `ids` et/ou `platform`."""
+    if not isinstance(payload, dict):
+        raise ValueError("Objet JSON attendu.")
+    raw_ids = payload.get("ids") or []
+    platform = _text_value(payload, "platform") or None
+
+    if not isinstance(raw_ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in raw_ids):
+        raise ValueError("Le champ ids doit être une liste d'entiers.")
+    if len(raw_ids) > BULK_MAX_IDS:
+        raise ValueError(f"Au plus {BULK_MAX_IDS} ids par requête.")
+    if not raw_ids and not platform:
+        raise ValueError("Précise ids ou platform.")
+
+    return list(dict.fromkeys(raw_ids)), platform
+
+
+def _bulk_conditions(ids: list[int], platform: str | None) -> list:
+    conditions = []
+    if ids:
+        conditions.append(Game.id.in_(ids))
+    if platform:
+        conditions.append(Game.platform == platform)
+    return conditions
+
+
+def bulk_update_games(ids: list[int], platform: str | None, changes: dict[str, Any]) -> list[dict[str, Any]]:
+    """Applique les mêmes modifications à toutes les lignes sélectionnées.
+
+    Un seul UPDATE ... RETURNING et, si titre ou plateforme changent, une seule
+    invalidation de cache, dans une unique transaction.
+    """
+    columns = [getattr(Game, name) for name in Game.PUBLIC_FIELDS]
+    statement = (
+        update(Game)
+        .where(*_bulk_conditions(ids, platform))
+        .values(**changes)
+        .returning(*columns)
+        .execution_options(synchronize_session=False)
+    )
+    rows = [dict(zip(Game.PUBLIC_FIELDS, row)) for row in db.session.execute(statement)]
+    for row in rows:
+        row["created_at"] = row["created_at"].isoformat()
+
+    if rows:
+        if any(name in changes for name in SHEET_SOURCE_FIELDS):
+            invalidate_sheet_caches([row["id"] for row in rows])
+        bump_collection_version()
+    db.session.commit()
+    return sorted(rows, key=lambda row: (row["title"], row["id"]))
+
+
+def bulk_delete_games(ids: list[int], platform: str | None) -> list[int]:
+    conditions = _bulk_conditions(ids, platform)
+    # Les ids sont lus d'abord pour purger le cache des fiches avant la
+    # suppression (la cascade SQL ne suffit pas sur toutes les bases).
+    deleted_ids = list(db.session.scalars(select(Game.id).where(*conditions)))
+    if deleted_ids:
+        invalidate_sheet_caches(deleted_ids)
+        db.session.execute(
+            delete(Game).where(Game.id.in_(deleted_ids)).execution_options(synchronize_session=False)
+        )
+        bump_collection_version()
+    db.session.commit()
+    return deleted_ids
@@ -2,29 +2,31 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 import hashlib
+import json
 from typing import Any
 
 from ..extensions import db
+from ..igdb import PRIORITY_SHEET_BUILD, game_details_many
 from ..models import Game, GameSheetCache
+from .igdb_mirror_service import record_igdb_games, search_metadata
+from .invalidation_service import publish_sheet_invalidation
+from .matching_service import find_best_match, forget_matches, get_saved_matches, save_matches
+
+
+# Seuls ces champs influencent la correspondance IGDB: les autres champs
+# locaux sont superposés à la lecture par `encode_sheet_from_cache`.
+SHEET_SOURCE_FIELDS = ("title", "platform")
 
 
 def build_sheet_fingerprint(game: Game) -> str:
-    raw = "|".join(
-        [
-            str(game.id),
-            game.title or "",
-            game.platform or "",
-            "1" if bool(game.completed) else "0",
-            game.ownership_type or "",
-            game.release_date or "",
-            game.cover_url or "",
-            game.description or "",
-            game.genre or "",
-        ]
-    )
+    raw = "|".join([str(game.id), *(getattr(game, name) or "" for name in SHEET_SOURCE_FIELDS)])
     return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 
+def sheet_source_changed(game: Game, changes: dict[str, Any]) -> bool:
+    return any(name in changes and changes[name] != getattr(game, name) for name in SHEET_SOURCE_FIELDS)
+
+
 def build_sheet_fallback_payload(game: Game) -> dict[str, Any]:
     return {
         "id": game.id,
@@ -43,22 +45,124 @@ def build_sheet_fallback_payload(game: Game) -> dict[str, Any]:
     }
 
 
-def build_sheet_payload_from_cache(game: Game, cache_row: GameSheetCache) -> dict[str, Any]:
+# Champs toujours issus du jeu local, et champs distants complétés par le jeu
+# local quand IGDB ne les fournit pas.
+_LOCAL_SHEET_FIELDS = ("id", "platform", "completed", "ownership_type")
+_OVERLAY_CAPABLE_FIELDS = ("title", "release_date", "release_year", "cover_url", "description", "images")
+
+
+def _encode_json(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_sheet_from_cache(game: Game, cache_row: GameSheetCache) -> str:
+    """Fiche JSON servie depuis le cache, sans décoder la partie distante.
+
+    Le petit objet des champs locaux est fusionné textuellement avec
+    `payload_json`: leurs clés sont disjointes par construction.
+    """
+    fallback = build_sheet_fallback_payload(game)
+    overlay_names = [*_LOCAL_SHEET_FIELDS, *(name for name in cache_row.overlay_fields.split(",") if name)]
+    overlay_json = _encode_json({name: fallback[name] for name in overlay_names})
+    return f"{overlay_json[:-1]},{cache_row.payload_json[1:]}"
+
+
+def _split_remote_payload(payload: dict[str, Any]) -> tuple[str, str]:
+    """(partie distante encodée, champs à compléter localement) pour `upsert_sheet_cache`."""
+    remote = {
+        "publisher": payload.get("publisher"),
+        "description_fr": payload.get("description_fr"),
+        "videos": payload.get("videos") or [],
+    }
+    overlay_fields: list[str] = []
+    for name in _OVERLAY_CAPABLE_FIELDS:
+        if payload.get(name):
+            remote[name] = payload[name]
+        else:
+            overlay_fields.append(name)
+    return _encode_json(remote), ",".join(overlay_fields)
+
+
+def _is_cache_row_usable(cache_row: GameSheetCache | None, fingerprint: str) -> bool:
+    # Une ligne antérieure au format pré-encodé (payload_json vide) est reconstruite.
+    return bool(cache_row and cache_row.payload_json and cache_row.source_fingerprint == fingerprint)
+
+
+def _is_cache_row_fresh(cache_row: GameSheetCache, ttl_seconds: int, now_dt: datetime) -> bool:
+    return cache_row.cached_at >= now_dt - timedelta(seconds=ttl_seconds)
+
+
+def _remote_sheet_fields(details: dict[str, Any]) -> dict[str, Any]:
+    # Uniquement les données distantes: les champs locaux sont superposés à la
+    # lecture, une modification locale ne rend donc pas ce cache obsolète.
     return {
-        "id": game.id,
-        "title": cache_row.title or game.title,
-        "platform": game.platform,
-        "completed": game.completed,
-        "ownership_type": game.ownership_type,
-        "release_date": cache_row.release_date or game.release_date,
-        "release_year": cache_row.release_year
-        or (int(game.release_date[:4]) if game.release_date and len(game.release_date) >= 4 else None),
-        "publisher": cache_row.publisher,
-        "cover_url": cache_row.cover_url or game.cover_url,
-        "description_fr": cache_row.description_fr,
-        "description": cache_row.description or game.description,
-        "images": cache_row.get_images() or ([game.cover_url] if game.cover_url else []),
-        "videos": cache_row.get_videos(),
+        "igdb_id": details.get("igdb_id"),
+        "title": details.get("title"),
+        "release_date": details.get("release_date"),
+        "release_year": details.get("release_year"),
+        "publisher": details.get("publisher"),
+        "cover_url": details.get("cover_url"),
+        "description_fr": details.get("description_fr"),
+        "description": details.get("description"),
+        "genres": details.get("genres") or [],
+        "images": details.get("images") or [],
+        "videos": details.get("videos") or [],
+    }
+
+
+def build_remote_sheet_payloads(
+    games: list[Game],
+    client_id: str,
+    client_secret: str,
+    priority: int = PRIORITY_SHEET_BUILD,
+) -> dict[int, dict[str, Any]]:
+    """Interroge IGDB et renvoie les données distantes des fiches, par game_id.
+
+    Les jeux déjà associés à une entrée IGDB (titre et plateforme inchangés)
+    sautent la recherche; les autres font une recherche chacun, et un seul
+    appel de détails sert tous les jeux. Les jeux sans correspondance IGDB
+    sont absents du résultat. Appel lent: à exécuter hors du thread de requête.
+    """
+    fingerprints = {game.id: build_sheet_fingerprint(game) for game in games}
+    matches = get_saved_matches(fingerprints)
+
+    decisions: dict[int, tuple[int, str, int]] = {}
+    for game in games:
+        if game.id in matches:
+            continue
+        results = search_metadata(
+            client_id=client_id,
+            client_secret=client_secret,
+            query=game.title,
+            page_size=10,
+            priority=priority,
+        )
+        best = find_best_match(results=results, title=game.title, platform=game.platform, release_date=game.release_date)
+        if best:
+            score, item = best
+            matches[game.id] = item["igdb_id"]
+            decisions[game.id] = (item["igdb_id"], fingerprints[game.id], score)
+    save_matches(decisions)
+
+    if not matches:
+        return {}
+
+    details_by_igdb_id = game_details_many(
+        client_id=client_id,
+        client_secret=client_secret,
+        igdb_ids=list(matches.values()),
+        # Résumés FR du lot récupérés ensemble (recherches parallèles, extraits groupés).
+        include_french_summary=True,
+        priority=priority,
+    )
+    record_igdb_games(details_by_igdb_id.values())
+
+    # Entrée IGDB disparue: la décision sera reprise par une nouvelle recherche.
+    forget_matches([game_id for game_id, igdb_id in matches.items() if igdb_id not in details_by_igdb_id])
+    return {
+        game_id: _remote_sheet_fields(details_by_igdb_id[igdb_id])
+        for game_id, igdb_id in matches.items()
+        if igdb_id in details_by_igdb_id
     }
 
 
@@ -67,16 +171,63 @@ def get_valid_sheet_cache(game: Game, ttl_seconds: int) -> tuple[GameSheetCache
     fingerprint = build_sheet_fingerprint(game)
     cache_row = GameSheetCache.query.filter_by(game_id=game.id).first()
 
-    if (
-        cache_row
-        and cache_row.source_fingerprint == fingerprint
-        and cache_row.cached_at >= now_dt - timedelta(seconds=ttl_seconds)
-    ):
+    if _is_cache_row_usable(cache_row, fingerprint) and _is_cache_row_fresh(cache_row, ttl_seconds, now_dt):
         return cache_row, fingerprint
 
     return None, fingerprint
 
 
+def get_sheet_cache(game: Game, ttl_seconds: int) -> tuple[GameSheetCache | None, bool]:
+    """Variante stale-while-revalidate de `get_valid_sheet_cache`.
+
+    Une ligne expirée mais dont l'empreinte correspond est renvoyée avec
+    `stale=True`: l'appelant la sert tout de suite et planifie un
+    rafraîchissement.
+    """
+    cache_row = GameSheetCache.query.filter_by(game_id=game.id).first()
+    if not _is_cache_row_usable(cache_row, build_sheet_fingerprint(game)):
+        return None, False
+    return cache_row, not _is_cache_row_fresh(cache_row, ttl_seconds, datetime.utcnow())
+
+
+def get_cached_sheet_payloads(game_ids: list[int], ttl_seconds: int) -> tuple[dict[int, str], list[int], list[int]]:
+    """Résout plusieurs fiches en une seule requête (jointure games/cache).
+
+    Renvoie les fiches JSON (déjà encodées) servies depuis le cache (y compris
+    expirées), les ids sans fiche utilisable et les ids dont la fiche servie
+    est expirée.
+    """
+    if not game_ids:
+        return {}, [], []
+
+    now_dt = datetime.utcnow()
+    rows = (
+        db.session.query(Game, GameSheetCache)
+        .outerjoin(GameSheetCache, GameSheetCache.game_id == Game.id)
+        .filter(Game.id.in_(game_ids))
+        .all()
+    )
+
+    payloads: dict[int, str] = {}
+    misses: list[int] = []
+    stale: list[int] = []
+    for game, cache_row in rows:
+        if not _is_cache_row_usable(cache_row, build_sheet_fingerprint(game)):
+            misses.append(game.id)
+            continue
+        payloads[game.id] = encode_sheet_from_cache(game, cache_row)
+        if not _is_cache_row_fresh(cache_row, ttl_seconds, now_dt):
+            stale.append(game.id)
+    return payloads, misses, stale
+
+
+def find_sheets_due_for_refresh(refresh_before: datetime, limit: int, exclude_ids: set[int]) -> list[int]:
+    query = db.session.query(GameSheetCache.game_id).filter(GameSheetCache.cached_at < refresh_before)
+    if exclude_ids:
+        query = query.filter(GameSheetCache.game_id.notin_(exclude_ids))
+    return [row[0] for row in query.order_by(GameSheetCache.cached_at.asc()).limit(limit).all()]
+
+
 def upsert_sheet_cache(game: Game, fingerprint: str, payload: dict[str, Any], *, cached_at: datetime | None = None) -> None:
     cache_row = GameSheetCache.query.filter_by(game_id=game.id).first()
     if not cache_row:
@@ -91,10 +242,12 @@ def upsert_sheet_cache(game: Game, fingerprint: str, payload: dict[str, Any], *,
     cache_row.cover_url = payload.get("cover_url")
     cache_row.description = payload.get("description")
     cache_row.description_fr = payload.get("description_fr")
-    cache_row.set_images(payload.get("images") or [])
-    cache_row.set_videos(payload.get("videos") or [])
+    cache_row.images = payload.get("images") or []
+    cache_row.videos = payload.get("videos") or []
+    cache_row.payload_json, cache_row.overlay_fields = _split_remote_payload(payload)
     cache_row.cached_at = cached_at or datetime.utcnow()
     db.session.add(cache_row)
+    publish_sheet_invalidation([game.id])
     db.session.commit()
 
 
@@ -102,3 +255,11 @@ def invalidate_sheet_cache(game_id: int) -> None:
     cache_row = GameSheetCache.query.filter_by(game_id=game_id).first()
     if cache_row:
         db.session.delete(cache_row)
+    publish_sheet_invalidation([game_id])
+
+
+def invalidate_sheet_caches(game_ids: list[int]) -> None:
+    if not game_ids:
+        return
+    db.session.query(GameSheetCache).filter(GameSheetCache.game_id.in_(game_ids)).delete(synchronize_session=False)
+    publish_sheet_invalidation(game_ids)
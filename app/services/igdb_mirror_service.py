@@ -0,0 +1,252 @@
+"""Miroir local du catalogue IGDB (tables `igdb_games` et `igdb_platforms`).
+
+Les résultats reçus d'IGDB sont enregistrés au passage (recherche, détails)
+et par `flask igdb-sync`. La recherche interroge d'abord le miroir:
+- correspondance fiable sur une plateforme synchronisée en entier et
+  récemment: le miroir suffit;
+- correspondance fiable ailleurs: réponse locale, IGDB est interrogé en
+  arrière-plan pour compléter le miroir (sorties récentes, jeux non synchronisés);
+- sinon IGDB répond; s'il est indisponible, les résultats locaux sont servis.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from flask import current_app
+
+from ..constants import MIRROR_SEARCH_CANDIDATES, MIRROR_SYNC_CHECKPOINT_NAME, MIRROR_SYNC_FRESH_SECONDS
+from ..extensions import db
+from ..igdb import (
+    IGDB_MAX_LIMIT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    list_platform_games,
+    list_platforms,
+    rank_search_results,
+    refresh_search_games,
+    score_title_match,
+    search_games,
+)
+from ..models import IgdbGame, IgdbPlatform, JobCheckpoint
+
+
+logger = logging.getLogger(__name__)
+
+# Scores de `score_title_match`: titre identique / requête contenue dans le titre.
+EXACT_TITLE_SCORE = 400
+CONTAINED_TITLE_SCORE = 180
+
+
+def normalize_mirror_title(value: str | None) -> str:
+    cleaned = "".join(ch for ch in (value or "").lower() if ch.isalnum() or ch.isspace())
+    return " ".join(cleaned.split())[:255]
+
+
+def _upsert(model, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    with db.engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            statement = pg_insert(model).values(rows)
+            columns = {name: statement.excluded[name] for name in rows[0] if name != "id"}
+            connection.execute(statement.on_conflict_do_update(index_elements=[model.id], set_=columns))
+        else:
+            connection.execute(delete(model).where(model.id.in_([row["id"] for row in rows])))
+            connection.execute(model.__table__.insert(), rows)
+
+
+def record_igdb_games(items: Iterable[dict[str, Any]]) -> int:
+    """Enregistre des résultats IGDB normalisés (recherche ou détails)."""
+    now = datetime.utcnow()
+    rows: dict[int, dict[str, Any]] = {}
+    for item in items:
+        igdb_id = item.get("igdb_id")
+        title = (item.get("title") or "").strip()
+        if not isinstance(igdb_id, int) or not title:
+            continue
+        rows[igdb_id] = {
+            "id": igdb_id,
+            "title": title[:255],
+            "normalized_title": normalize_mirror_title(title),
+            "release_date": item.get("release_date"),
+            "cover_url": item.get("cover_url"),
+            "genres": list(item.get("genres") or []),
+            "platforms": list(item.get("platforms") or []),
+            "updated_at": now,
+        }
+
+    try:
+        _upsert(IgdbGame, list(rows.values()))
+    except Exception:
+        # Le miroir n'est qu'un accélérateur: l'appelant a déjà son résultat.
+        logger.debug("Enregistrement du miroir IGDB impossible.", exc_info=True)
+        return 0
+    return len(rows)
+
+
+def record_igdb_platforms(rows: Iterable[dict[str, Any]]) -> int:
+    now = datetime.utcnow()
+    values = [
+        {
+            "id": row["id"],
+            "name": str(row.get("name") or "")[:255],
+            "alternative_name": (str(row["alternative_name"])[:255] if row.get("alternative_name") else None),
+            "normalized_name": normalize_mirror_title(row.get("name")),
+            "updated_at": now,
+        }
+        for row in rows
+        if isinstance(row.get("id"), int) and row.get("name")
+    ]
+    _upsert(IgdbPlatform, values)
+    return len(values)
+
+
+def search_local_games(query: str, page_size: int = 5, platform: str | None = None) -> tuple[list[dict[str, Any]], bool]:
+    """Recherche dans le miroir. Renvoie (résultats classés, fiable?)."""
+    normalized = normalize_mirror_title(query)
+    if not normalized:
+        return [], False
+
+    condition = IgdbGame.normalized_title.contains(normalized, autoescape=True)
+    order_by = [func.length(IgdbGame.normalized_title), IgdbGame.id]
+    if db.engine.dialect.name == "postgresql":
+        # `%` (similarité pg_trgm) tolère les fautes de frappe; l'index GIN sert les deux conditions.
+        condition = or_(condition, IgdbGame.normalized_title.op("%")(normalized))
+        order_by = [func.similarity(IgdbGame.normalized_title, normalized).desc(), IgdbGame.id]
+
+    rows = db.session.execute(select(IgdbGame).where(condition).order_by(*order_by).limit(MIRROR_SEARCH_CANDIDATES)).scalars()
+    results = rank_search_results([row.to_search_result() for row in rows], query, page_size, platform)
+    if not results:
+        return [], False
+
+    top_score = score_title_match(str(results[0].get("title") or ""), query)
+    confident = top_score >= EXACT_TITLE_SCORE or (len(results) >= page_size and top_score >= CONTAINED_TITLE_SCORE)
+    return results, confident
+
+
+def _synced_platforms() -> dict[str, str]:
+    row = db.session.get(JobCheckpoint, MIRROR_SYNC_CHECKPOINT_NAME)
+    return dict(row.state or {}) if row else {}
+
+
+def is_platform_mirror_complete(platform: str | None) -> bool:
+    """Vrai si `flask igdb-sync` a copié toute la plateforme récemment."""
+    if not platform:
+        return False
+    synced_at = _synced_platforms().get(normalize_mirror_title(platform))
+    if not synced_at:
+        return False
+    return datetime.fromisoformat(synced_at) >= datetime.utcnow() - timedelta(seconds=MIRROR_SYNC_FRESH_SECONDS)
+
+
+def _mark_platform_synced(platform: str) -> None:
+    state = _synced_platforms()
+    state[normalize_mirror_title(platform)] = datetime.utcnow().isoformat()
+    db.session.merge(JobCheckpoint(name=MIRROR_SYNC_CHECKPOINT_NAME, state=state, updated_at=datetime.utcnow()))
+    db.session.commit()
+
+
+def _mirror_recorder():
+    # Appelé aussi depuis le thread de rafraîchissement IGDB, hors contexte.
+    app = current_app._get_current_object()
+
+    def record(results: list[dict[str, Any]]) -> None:
+        with app.app_context():
+            record_igdb_games(results)
+
+    return record
+
+
+def search_metadata(
+    client_id: str,
+    client_secret: str,
+    query: str,
+    page_size: int = 5,
+    platform: str | None = None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> list[dict[str, Any]]:
+    """Recherche de jeux: miroir local d'abord, IGDB en cas de doute (voir le module)."""
+    try:
+        local_results, confident = search_local_games(query, page_size, platform)
+        complete = confident and is_platform_mirror_complete(platform)
+    except Exception:
+        # Ex.: pg_trgm absent. La transaction en échec ne doit pas bloquer la suite.
+        db.session.rollback()
+        logger.debug("Recherche locale IGDB impossible.", exc_info=True)
+        local_results, confident, complete = [], False, False
+
+    # Seuls les résultats tout juste reçus d'IGDB sont copiés dans le miroir.
+    record = _mirror_recorder()
+    if complete:
+        return local_results
+    if confident:
+        refresh_search_games(
+            client_id=client_id,
+            client_secret=client_secret,
+            query=query,
+            page_size=page_size,
+            platform=platform,
+            on_remote_results=record,
+        )
+        return local_results
+
+    try:
+        return search_games(
+            client_id=client_id,
+            client_secret=client_secret,
+            query=query,
+            page_size=page_size,
+            platform=platform,
+            priority=priority,
+            on_remote_results=record,
+        )
+    except Exception:
+        # IGDB indisponible (ou budget épuisé): mieux vaut une réponse locale approximative.
+        if local_results:
+            return local_results
+        raise
+
+
+def sync_igdb_mirror(
+    client_id: str,
+    client_secret: str,
+    platforms: list[str],
+    max_games_per_platform: int,
+    on_progress: Callable[[str, int], None] | None = None,
+) -> int:
+    """Synchronise les plateformes IGDB puis les jeux des plateformes données.
+
+    Une plateforme copiée en entier (sans atteindre `max_games_per_platform`)
+    est marquée à jour: la recherche locale y fait alors foi. Appel long
+    (plusieurs requêtes IGDB par plateforme), en priorité basse. Renvoie le nombre de jeux enregistrés.
+    """
+    record_igdb_platforms(list_platforms(client_id=client_id, client_secret=client_secret, priority=PRIORITY_BACKGROUND))
+
+    total = 0
+    for platform in platforms:
+        synced = 0
+        while synced < max_games_per_platform:
+            page = list_platform_games(
+                client_id=client_id,
+                client_secret=client_secret,
+                platform=platform,
+                offset=synced,
+                limit=min(IGDB_MAX_LIMIT, max_games_per_platform - synced),
+                priority=PRIORITY_BACKGROUND,
+            )
+            record_igdb_games(page)
+            synced += len(page)
+            if len(page) < IGDB_MAX_LIMIT:
+                # Dernière page atteinte: la plateforme est copiée en entier.
+                _mark_platform_synced(platform)
+                break
+        total += synced
+        if on_progress:
+            on_progress(platform, synced)
+    return total
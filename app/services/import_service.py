@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import IO, Any, Iterator
+
+from sqlalchemy import insert
+
+from ..constants import IMPORT_BATCH_SIZE, IMPORT_MAX_REPORTED_ERRORS
+from ..extensions import db
+from ..models import Game
+from .collection_service import bump_collection_version
+from .game_service import build_new_game_values
+
+
+IMPORT_FORMATS = {"csv", "ndjson"}
+
+_TRUE_VALUES = {"1", "true", "yes", "oui", "vrai", "x"}
+_OPTIONAL_TEXT_FIELDS = ("genre", "release_date", "cover_url", "description")
+
+
+def detect_import_format(explicit: str | None, mimetype: str | None) -> str:
+    candidate = (explicit or "").strip().lower()
+    if not candidate:
+        candidate = "csv" if (mimetype or "").lower() in {"text/csv", "application/csv"} else "ndjson"
+    if candidate not in IMPORT_FORMATS:
+        raise ValueError("Format d'import attendu: csv ou ndjson.")
+    return candidate
+
+
+def _normalize_csv_row(row: dict[str, Any]) -> dict[str, Any]:
+    # En CSV tout est texte: bool("false") vaut True, et "" doit devenir NULL.
+    payload = {key.strip(): value for key, value in row.items() if key}
+    payload["completed"] = (payload.get("completed") or "").strip().lower() in _TRUE_VALUES
+    for name in _OPTIONAL_TEXT_FIELDS:
+        payload[name] = (payload.get(name) or "").strip() or None
+    return payload
+
+
+def iter_import_rows(stream: IO[bytes], fmt: str) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Lit le corps de requête au fil de l'eau.
+
+    Produit `(numéro de ligne, payload, erreur)`; le payload vaut None quand la
+    ligne est illisible.
+    """
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            yield reader.line_num, _normalize_csv_row(row), None
+        return
+
+    for line_number, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            yield line_number, None, "JSON invalide."
+            continue
+        if not isinstance(payload, dict):
+            yield line_number, None, "Objet JSON attendu."
+            continue
+        yield line_number, payload, None
+
+
+def _flush_batch(batch: list[tuple[int, dict[str, Any]]]) -> str | None:
+    try:
+        db.session.execute(insert(Game), [values for _, values in batch])
+        bump_collection_version()
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        return f"Échec d'insertion: {exc.__class__.__name__}"
+    return None
+
+
+def import_games(
+    rows: Iterator[tuple[int, dict[str, Any] | None, str | None]],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> dict[str, Any]:
+    """Insère les lignes valides par lots, une transaction par lot.
+
+    Un lot en échec est annulé seul: les lots déjà validés restent en base,
+    et ses lignes sont réessayées une par une pour isoler celles en faute.
+    """
+    imported = 0
+    failed = 0
+    errors: list[dict[str, Any]] = []
+    batch: list[tuple[int, dict[str, Any]]] = []
+
+    def record_error(line_number: int, message: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"line": line_number, "error": message})
+
+    def flush() -> None:
+        nonlocal imported
+        if not _flush_batch(batch):
+            imported += len(batch)
+        else:
+            for row in batch:
+                row_error = _flush_batch([row])
+                if row_error:
+                    record_error(row[0], row_error)
+                else:
+                    imported += 1
+        batch.clear()
+
+    for line_number, payload, error in rows:
+        if error or payload is None:
+            record_error(line_number, error or "Ligne illisible.")
+            continue
+        try:
+            batch.append((line_number, build_new_game_values(payload)))
+        except ValueError as exc:
+            record_error(line_number, str(exc))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
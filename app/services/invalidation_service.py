@@ -0,0 +1,221 @@
+"""Diffusion des invalidations entre workers et vers les navigateurs.
+
+Les écritures publient un événement via `pg_notify` dans leur transaction:
+PostgreSQL ne le délivre qu'au commit, et jamais en cas de rollback. Chaque
+worker écoute le canal dans un thread dédié et relaie les événements aux
+abonnés locaux (état du rafraîchisseur, flux SSE `/api/events`). Hors
+PostgreSQL (un seul processus), l'événement est relayé localement au commit.
+
+Événements: `{"type": "sheets", "ids": [...]}` (fiches à oublier),
+`{"type": "collection", "origin": ...}` (liste des jeux modifiée; `origin`
+identifie l'onglet auteur, qui a déjà rechargé) et `{"type": "resync"}`
+(événements possiblement perdus: tout oublier).
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import re
+import select
+import threading
+import time
+from typing import Any, Callable
+
+from flask import Flask, has_request_context, request
+from sqlalchemy import event, text
+
+from ..constants import (
+    CLIENT_ID_HEADER,
+    EVENT_STREAM_QUEUE_SIZE,
+    INVALIDATION_CHANNEL,
+    INVALIDATION_LISTENER_RETRY_SECONDS,
+    INVALIDATION_NOTIFY_MAX_IDS,
+)
+from ..extensions import db
+
+
+RESYNC_EVENT = {"type": "resync"}
+_CLIENT_ID_PATTERN = re.compile(r"^[A-Za-z0-9-]{1,64}$")
+
+_handlers: list[Callable[[dict[str, Any]], None]] = []
+_handlers_lock = threading.Lock()
+_listener_started = False
+_session_hooks_installed = False
+
+
+def add_invalidation_handler(handler: Callable[[dict[str, Any]], None]) -> None:
+    with _handlers_lock:
+        _handlers.append(handler)
+
+
+def remove_invalidation_handler(handler: Callable[[dict[str, Any]], None]) -> None:
+    with _handlers_lock:
+        if handler in _handlers:
+            _handlers.remove(handler)
+
+
+def dispatch_local(event_data: dict[str, Any]) -> None:
+    with _handlers_lock:
+        handlers = list(_handlers)
+    for handler in handlers:
+        try:
+            handler(event_data)
+        except Exception:
+            # Un abonné défaillant ne doit pas priver les autres.
+            pass
+
+
+def _publish(event_data: dict[str, Any]) -> None:
+    """Publie un événement dans la transaction courante de `db.session`."""
+    if db.session.get_bind().dialect.name == "postgresql":
+        db.session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": INVALIDATION_CHANNEL, "payload": json.dumps(event_data, separators=(",", ":"))},
+        )
+    else:
+        db.session.info.setdefault("pending_invalidations", []).append(event_data)
+
+
+def publish_sheet_invalidation(game_ids: list[int]) -> None:
+    ids = sorted({int(game_id) for game_id in game_ids})
+    for start in range(0, len(ids), INVALIDATION_NOTIFY_MAX_IDS):
+        _publish({"type": "sheets", "ids": ids[start : start + INVALIDATION_NOTIFY_MAX_IDS]})
+
+
+def _request_origin() -> str | None:
+    if not has_request_context():
+        return None
+    client_id = request.headers.get(CLIENT_ID_HEADER) or ""
+    return client_id if _CLIENT_ID_PATTERN.match(client_id) else None
+
+
+def publish_collection_change() -> None:
+    # Une seule notification par transaction suffit.
+    if db.session.info.get("collection_change_published"):
+        return
+    db.session.info["collection_change_published"] = True
+    event_data: dict[str, Any] = {"type": "collection"}
+    origin = _request_origin()
+    if origin:
+        event_data["origin"] = origin
+    _publish(event_data)
+
+
+def install_session_hooks() -> None:
+    """Relaie localement les événements publiés hors PostgreSQL, au commit."""
+    global _session_hooks_installed
+    if _session_hooks_installed:
+        return
+    _session_hooks_installed = True
+
+    @event.listens_for(db.session, "after_commit")
+    def _after_commit(session) -> None:
+        session.info.pop("collection_change_published", None)
+        for event_data in session.info.pop("pending_invalidations", []):
+            dispatch_local(event_data)
+
+    @event.listens_for(db.session, "after_rollback")
+    def _after_rollback(session) -> None:
+        session.info.pop("collection_change_published", None)
+        session.info.pop("pending_invalidations", None)
+
+
+def _listen_forever(app: Flask) -> None:
+    while True:
+        raw_connection = None
+        try:
+            with app.app_context():
+                raw_connection = db.engine.raw_connection()
+            connection = raw_connection.driver_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+            # Des événements ont pu être manqués pendant la (re)connexion.
+            dispatch_local(RESYNC_EVENT)
+
+            while True:
+                if not select.select([connection], [], [], 60)[0]:
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notification = connection.notifies.pop(0)
+                    try:
+                        event_data = json.loads(notification.payload)
+                    except ValueError:
+                        continue
+                    dispatch_local(event_data)
+        except Exception:
+            app.logger.warning("Écoute des invalidations interrompue, reconnexion.", exc_info=True)
+        finally:
+            if raw_connection is not None:
+                try:
+                    # Connexion en LISTEN: on ne la rend pas au pool.
+                    raw_connection.invalidate()
+                except Exception:
+                    pass
+        time.sleep(INVALIDATION_LISTENER_RETRY_SECONDS)
+
+
+def start_invalidation_listener(app: Flask) -> None:
+    """Démarre le thread d'écoute `LISTEN` (une fois par processus, PostgreSQL uniquement)."""
+    global _listener_started
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            return
+
+    with _handlers_lock:
+        if _listener_started:
+            return
+        _listener_started = True
+
+    threading.Thread(target=_listen_forever, args=(app,), name="invalidation-listener", daemon=True).start()
+
+
+class EventSubscription:
+    """File d'événements d'un flux SSE; un débordement devient un `resync`."""
+
+    _open_count = 0
+    _count_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=EVENT_STREAM_QUEUE_SIZE)
+
+    @classmethod
+    def open(cls, max_subscribers: int) -> "EventSubscription | None":
+        """Abonne un nouveau flux, ou None si le plafond du processus est atteint."""
+        with cls._count_lock:
+            if cls._open_count >= max_subscribers:
+                return None
+            cls._open_count += 1
+        subscription = cls()
+        add_invalidation_handler(subscription)
+        return subscription
+
+    def close(self) -> None:
+        remove_invalidation_handler(self)
+        with self._count_lock:
+            EventSubscription._open_count -= 1
+
+    def __call__(self, event_data: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event_data)
+        except queue.Full:
+            self._drain()
+            try:
+                self.queue.put_nowait(RESYNC_EVENT)
+            except queue.Full:
+                pass
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def get(self, timeout: float) -> dict[str, Any] | None:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
@@ -0,0 +1,137 @@
+"""Moteur unique de correspondance titre/plateforme avec IGDB.
+
+Utilisé pour la recherche « par titre » et pour les fiches. Les décisions
+prises pour un jeu de la collection (game_id -> igdb_id) sont conservées:
+tant que son titre et sa plateforme ne changent pas, les rafraîchissements
+de fiche passent directement aux détails IGDB, sans recherche.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import re
+from typing import Any
+
+from ..extensions import db
+from ..igdb import normalize_title_text, platform_matches, score_title_matches
+from ..models import GameIgdbMatch
+
+
+# Un candidat est plausible si le titre cherché y figure tel quel (score
+# d'inclusion, voir igdb._score_normalized_title) ou s'il partage au moins la
+# moitié de ses mots avec lui; sinon ce n'est pas une correspondance.
+MIN_MATCH_SCORE = 180
+MIN_MATCH_OVERLAP = 0.5
+
+_YEAR_PATTERN = re.compile(r"(\d{4})")
+
+
+def _title_tokens(value: str) -> frozenset[str]:
+    return frozenset(normalize_title_text(value).split())
+
+
+def _word_overlap(wanted_tokens: frozenset[str], candidate_title: str) -> float:
+    tokens = _title_tokens(candidate_title)
+    return len(wanted_tokens & tokens) / len(wanted_tokens | tokens) if wanted_tokens or tokens else 0.0
+
+
+def _release_year(value: Any) -> int | None:
+    match = _YEAR_PATTERN.search(str(value or ""))
+    return int(match.group(1)) if match else None
+
+
+def rank_matches(
+    results: list[dict[str, Any]],
+    title: str,
+    platform: str | None = None,
+    release_date: str | None = None,
+) -> list[tuple[int, dict[str, Any]]]:
+    """Classe les candidats IGDB pour un jeu. Renvoie [(score titre, candidat)], meilleur d'abord.
+
+    Ordre: titre plausible, plateforme compatible (alias compris), score de
+    titre, part de mots communs, puis année de sortie la plus proche; l'ordre
+    IGDB départage les égalités restantes. La plateforme ne départage donc que
+    des titres plausibles: un titre sans rapport ne passe jamais devant.
+    """
+    if not results:
+        return []
+
+    title_scores = score_title_matches([str(item.get("title") or "") for item in results], title)
+    wanted_tokens = _title_tokens(title)
+    wanted_year = _release_year(release_date)
+
+    ranked = []
+    for index, (item, title_score) in enumerate(zip(results, title_scores)):
+        overlap = _word_overlap(wanted_tokens, str(item.get("title") or ""))
+        candidate_year = _release_year(item.get("release_date"))
+        year_distance = abs(candidate_year - wanted_year) if candidate_year and wanted_year else 100
+        sort_key = (
+            _is_plausible(title_score, overlap),
+            platform_matches(platform, item.get("platforms") or []),
+            title_score,
+            overlap,
+            -year_distance,
+            -index,
+        )
+        ranked.append((sort_key, title_score, item))
+
+    ranked.sort(key=lambda entry: entry[0], reverse=True)
+    return [(title_score, item) for _, title_score, item in ranked]
+
+
+def _is_plausible(title_score: int, overlap: float) -> bool:
+    return title_score >= MIN_MATCH_SCORE or overlap >= MIN_MATCH_OVERLAP
+
+
+def find_best_match(
+    results: list[dict[str, Any]],
+    title: str,
+    platform: str | None,
+    release_date: str | None = None,
+) -> tuple[int, dict[str, Any]] | None:
+    """Meilleur candidat et son score de titre, ou None si aucun n'est plausible."""
+    wanted_tokens = _title_tokens(title)
+    for title_score, item in rank_matches(results, title, platform, release_date):
+        if not _is_plausible(title_score, _word_overlap(wanted_tokens, str(item.get("title") or ""))):
+            # Classement: les candidats suivants ne sont pas plausibles non plus.
+            return None
+        if isinstance(item.get("igdb_id"), int):
+            return title_score, item
+    return None
+
+
+def pick_best_match(
+    results: list[dict[str, Any]],
+    title: str,
+    platform: str | None,
+    release_date: str | None = None,
+) -> dict[str, Any] | None:
+    best = find_best_match(results, title, platform, release_date)
+    return best[1] if best else None
+
+
+def get_saved_matches(fingerprints: dict[int, str]) -> dict[int, int]:
+    """igdb_id retenu par game_id, pour les décisions encore valides (empreinte identique)."""
+    if not fingerprints:
+        return {}
+    rows = GameIgdbMatch.query.filter(GameIgdbMatch.game_id.in_(list(fingerprints))).all()
+    return {row.game_id: row.igdb_id for row in rows if row.source_fingerprint == fingerprints[row.game_id]}
+
+
+def save_matches(decisions: dict[int, tuple[int, str, int]]) -> None:
+    """Enregistre {game_id: (igdb_id, empreinte, score)}."""
+    if not decisions:
+        return
+    now = datetime.utcnow()
+    for game_id, (igdb_id, fingerprint, score) in decisions.items():
+        db.session.merge(
+            GameIgdbMatch(game_id=game_id, igdb_id=igdb_id, source_fingerprint=fingerprint, score=score, matched_at=now)
+        )
+    db.session.commit()
+
+
+def forget_matches(game_ids: list[int]) -> None:
+    if not game_ids:
+        return
+    GameIgdbMatch.query.filter(GameIgdbMatch.game_id.in_(game_ids)).delete(synchronize_session=False)
+    db.session.commit()
@@ -0,0 +1,133 @@
+"""Construction des fiches de jeu en arrière-plan.
+
+Une fiche absente du cache demande plusieurs appels IGDB: plutôt que de bloquer
+un thread gunicorn, la route renvoie la fiche de repli et délègue la
+construction à un petit pool de threads propre au worker.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from flask import Flask, current_app
+
+from ..constants import DEFAULT_SHEET_BUILDER_WORKERS, DEFAULT_SHEET_CACHE_TTL_SECONDS, SHEET_BUILD_BATCH_SIZE
+from ..extensions import db
+from ..igdb import PRIORITY_BACKGROUND, PRIORITY_SHEET_BUILD
+from ..models import Game
+from .game_sheet_service import build_remote_sheet_payloads, get_valid_sheet_cache, upsert_sheet_cache
+
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+# game_id -> événement levé quand la construction se termine.
+_in_flight: dict[int, threading.Event] = {}
+
+
+def _get_executor(app: Flask) -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = int(app.config.get("SHEET_BUILDER_WORKERS", DEFAULT_SHEET_BUILDER_WORKERS))
+            _executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="sheet-builder")
+        return _executor
+
+
+def _build_sheets(
+    app: Flask,
+    game_ids: list[int],
+    ttl_seconds: int | None = None,
+    priority: int = PRIORITY_SHEET_BUILD,
+) -> set[int]:
+    """Construit les fiches dont le cache a plus de `ttl_seconds`.
+
+    Les ids doivent avoir été réservés via `_claim`. Renvoie les ids dont la
+    fiche est à jour à l'issue de l'appel.
+    """
+    built: set[int] = set()
+    with app.app_context():
+        try:
+            if ttl_seconds is None:
+                ttl_seconds = int(app.config.get("SHEET_CACHE_TTL_SECONDS", DEFAULT_SHEET_CACHE_TTL_SECONDS))
+
+            to_build: list[tuple[Game, str]] = []
+            for game in Game.query.filter(Game.id.in_(game_ids)).all():
+                cache_row, fingerprint = get_valid_sheet_cache(game=game, ttl_seconds=ttl_seconds)
+                if cache_row:
+                    built.add(game.id)
+                else:
+                    to_build.append((game, fingerprint))
+
+            if to_build:
+                payloads = build_remote_sheet_payloads(
+                    [game for game, _ in to_build],
+                    client_id=app.config.get("IGDB_CLIENT_ID", ""),
+                    client_secret=app.config.get("IGDB_CLIENT_SECRET", ""),
+                    priority=priority,
+                )
+                for game, fingerprint in to_build:
+                    if game.id in payloads:
+                        upsert_sheet_cache(game=game, fingerprint=fingerprint, payload=payloads[game.id])
+                        built.add(game.id)
+        except Exception:
+            db.session.rollback()
+            app.logger.warning("Construction des fiches %s impossible.", game_ids, exc_info=True)
+        finally:
+            with _lock:
+                events = [_in_flight.pop(game_id, None) for game_id in game_ids]
+            for event in events:
+                if event:
+                    event.set()
+    return built
+
+
+def _claim(game_ids: list[int]) -> list[int]:
+    """Réserve les ids qui ne sont pas déjà en cours de construction."""
+    claimed: list[int] = []
+    with _lock:
+        for game_id in dict.fromkeys(game_ids):
+            if game_id not in _in_flight:
+                _in_flight[game_id] = threading.Event()
+                claimed.append(game_id)
+    return claimed
+
+
+def run_sheet_builds(app: Flask, game_ids: list[int], ttl_seconds: int | None = None) -> set[int]:
+    """Construit des fiches dans le thread courant (rafraîchissement périodique).
+
+    Priorité IGDB la plus basse. Renvoie les ids effectivement à jour; les ids
+    déjà en construction ailleurs n'en font pas partie.
+    """
+    claimed = _claim(game_ids)
+    if not claimed:
+        return set()
+    return _build_sheets(app, claimed, ttl_seconds, priority=PRIORITY_BACKGROUND)
+
+
+def schedule_sheet_builds(game_ids: list[int]) -> None:
+    """Planifie la construction de fiches (sans doublon si déjà en cours).
+
+    Les ids sont regroupés par lots pour mutualiser l'appel de détails IGDB.
+    """
+    app = current_app._get_current_object()
+    claimed = _claim(game_ids)
+    executor = _get_executor(app)
+    for start in range(0, len(claimed), SHEET_BUILD_BATCH_SIZE):
+        executor.submit(_build_sheets, app, claimed[start : start + SHEET_BUILD_BATCH_SIZE])
+
+
+def schedule_sheet_build(game_id: int) -> None:
+    schedule_sheet_builds([game_id])
+
+
+def wait_for_sheet_build(game_id: int, timeout: float) -> bool:
+    """Attend la fin d'une construction en cours.
+
+    Renvoie False si la construction dure encore après `timeout` secondes.
+    """
+    with _lock:
+        event = _in_flight.get(game_id)
+    if event is None:
+        return True
+    return event.wait(timeout)
@@ -0,0 +1,126 @@
+"""Rafraîchissement périodique des fiches proches de l'expiration.
+
+Un thread par worker réveille régulièrement la tâche; sous PostgreSQL un
+verrou consultatif garantit qu'un seul worker rafraîchit à la fois.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import threading
+import time
+
+from flask import Flask
+from sqlalchemy import text
+
+from ..constants import (
+    DEFAULT_SHEET_CACHE_TTL_SECONDS,
+    SHEET_BUILD_BATCH_SIZE,
+    SHEET_REFRESH_FAILURE_BACKOFF_SECONDS,
+    SHEET_REFRESHER_LOCK_KEY,
+)
+from ..extensions import db
+from ..shared_cache import purge_expired_shared_cache
+from .game_sheet_service import find_sheets_due_for_refresh
+from .invalidation_service import add_invalidation_handler
+from .sheet_builder import run_sheet_builds
+
+
+_started = False
+_started_lock = threading.Lock()
+# game_id -> instant (monotonic) avant lequel on ne retente pas.
+_failed_until: dict[int, float] = {}
+
+
+def _try_lock(connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return True
+    return bool(connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SHEET_REFRESHER_LOCK_KEY}).scalar())
+
+
+def _unlock(connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SHEET_REFRESHER_LOCK_KEY})
+
+
+def refresh_due_sheets(app: Flask) -> int:
+    """Rafraîchit un lot de fiches expirées ou sur le point de l'être.
+
+    Les lots sont espacés de `SHEET_REFRESH_MIN_DELAY_SECONDS`.
+    Renvoie le nombre de fiches rafraîchies.
+    """
+    ttl_seconds = int(app.config.get("SHEET_CACHE_TTL_SECONDS", DEFAULT_SHEET_CACHE_TTL_SECONDS))
+    ahead_seconds = min(int(app.config["SHEET_REFRESH_AHEAD_SECONDS"]), ttl_seconds)
+    batch_size = int(app.config["SHEET_REFRESH_BATCH_SIZE"])
+    min_delay = float(app.config["SHEET_REFRESH_MIN_DELAY_SECONDS"])
+    # Une fiche "due" est considérée valide moins longtemps que le TTL normal.
+    refresh_ttl = ttl_seconds - ahead_seconds
+
+    now_mono = time.monotonic()
+    for game_id, retry_at in list(_failed_until.items()):
+        if retry_at <= now_mono:
+            _failed_until.pop(game_id, None)
+
+    refreshed = 0
+    with app.app_context():
+        with db.engine.connect() as connection:
+            if not _try_lock(connection):
+                return 0
+            try:
+                due_ids = find_sheets_due_for_refresh(
+                    refresh_before=datetime.utcnow() - timedelta(seconds=refresh_ttl),
+                    limit=batch_size,
+                    exclude_ids=set(_failed_until),
+                )
+                db.session.remove()
+
+                # Lots espacés: un appel de détails IGDB groupé par lot.
+                for start in range(0, len(due_ids), SHEET_BUILD_BATCH_SIZE):
+                    if start:
+                        time.sleep(min_delay)
+                    chunk = due_ids[start : start + SHEET_BUILD_BATCH_SIZE]
+                    built = run_sheet_builds(app, chunk, ttl_seconds=refresh_ttl)
+                    refreshed += len(built)
+                    for game_id in chunk:
+                        if game_id not in built:
+                            _failed_until[game_id] = time.monotonic() + SHEET_REFRESH_FAILURE_BACKOFF_SECONDS
+            finally:
+                _unlock(connection)
+    return refreshed
+
+
+def _on_invalidation(event_data: dict) -> None:
+    # Une fiche modifiée (éventuellement sur un autre worker) mérite une
+    # nouvelle tentative sans attendre la fin du backoff.
+    if event_data.get("type") == "sheets":
+        for game_id in event_data.get("ids") or []:
+            _failed_until.pop(game_id, None)
+    elif event_data.get("type") == "resync":
+        _failed_until.clear()
+
+
+def _refresh_loop(app: Flask, interval: int) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            refresh_due_sheets(app)
+            with app.app_context():
+                purge_expired_shared_cache()
+        except Exception:
+            app.logger.warning("Rafraîchissement des fiches impossible.", exc_info=True)
+
+
+def start_sheet_refresher(app: Flask) -> None:
+    """Démarre le thread de rafraîchissement (une fois par processus)."""
+    global _started
+    interval = int(app.config.get("SHEET_REFRESH_INTERVAL_SECONDS") or 0)
+    if interval <= 0 or not app.config.get("IGDB_CLIENT_ID") or not app.config.get("IGDB_CLIENT_SECRET"):
+        return
+
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+
+    add_invalidation_handler(_on_invalidation)
+    threading.Thread(target=_refresh_loop, args=(app, interval), name="sheet-refresher", daemon=True).start()
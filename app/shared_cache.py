@@ -0,0 +1,99 @@
+"""Cache de métadonnées partagé entre workers via la table `metadata_cache`.
+
+Chaque `SharedCache` garde un `TTLCache` local devant la base: une valeur
+récupérée par un worker (jeton Twitch, ids de plateforme, résumé Wikipédia)
+profite à tous les autres et survit aux redémarrages. Le cache partagé n'est
+qu'une optimisation: toute erreur SQL est ignorée.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from flask import has_app_context
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .extensions import db
+from .models import MetadataCache
+from .ttl_cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+def _read(key: str) -> tuple[bool, Any, float]:
+    with db.engine.connect() as connection:
+        row = connection.execute(
+            select(MetadataCache.value, MetadataCache.expires_at).where(
+                MetadataCache.key == key,
+                MetadataCache.expires_at > datetime.utcnow(),
+            )
+        ).first()
+    if row is None:
+        return False, None, 0
+    return True, row.value, (row.expires_at - datetime.utcnow()).total_seconds()
+
+
+def _write(key: str, value: Any, ttl_seconds: float) -> None:
+    expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+    with db.engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            statement = pg_insert(MetadataCache).values(key=key, value=value, expires_at=expires_at)
+            connection.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[MetadataCache.key],
+                    set_={"value": statement.excluded.value, "expires_at": statement.excluded.expires_at},
+                )
+            )
+        else:
+            connection.execute(delete(MetadataCache).where(MetadataCache.key == key))
+            connection.execute(MetadataCache.__table__.insert().values(key=key, value=value, expires_at=expires_at))
+
+
+def purge_expired_shared_cache() -> int:
+    with db.engine.begin() as connection:
+        result = connection.execute(delete(MetadataCache).where(MetadataCache.expires_at <= datetime.utcnow()))
+    return result.rowcount or 0
+
+
+class SharedCache:
+    """Cache à deux niveaux: mémoire du processus puis table PostgreSQL."""
+
+    def __init__(self, namespace: str, local: TTLCache) -> None:
+        self.namespace = namespace
+        self.local = local
+
+    def _db_key(self, key: Any) -> str:
+        return f"{self.namespace}:{key}"
+
+    def lookup(self, key: Any) -> tuple[bool, Any]:
+        found, value = self.local.lookup(key)
+        if found or not has_app_context():
+            return found, value
+
+        try:
+            found, value, remaining = _read(self._db_key(key))
+        except Exception:
+            logger.debug("Lecture du cache partagé impossible.", exc_info=True)
+            return False, None
+        if found and remaining > 0:
+            # L'entrée locale n'expire pas après l'entrée partagée.
+            self.local.set(key, value, ttl_seconds=min(remaining, self.local.ttl_for(value)))
+        return found, value
+
+    def set(self, key: Any, value: Any, ttl_seconds: float | None = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = self.local.ttl_for(value)
+        self.local.set(key, value, ttl_seconds=ttl_seconds)
+        if not has_app_context():
+            return
+        try:
+            _write(self._db_key(key), value, ttl_seconds)
+        except Exception:
+            logger.debug("Écriture du cache partagé impossible.", exc_info=True)
+
+    def stats(self) -> dict[str, int]:
+        return self.local.stats()
@@ -0,0 +1,77 @@
+"""Coalescence des appels identiques concurrents (single-flight).
+
+Quand plusieurs threads demandent le même travail au même moment, seul le
+premier l'exécute; les autres attendent et reçoivent le même résultat (ou la
+même exception). Rien n'est mis en cache une fois l'appel terminé.
+"""
+
+from __future__ import annotations
+
+from functools import wraps
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+_group = SingleFlight()
+
+
+def single_flight(key_fn: Callable[..., Hashable]) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Décorateur: coalesce les appels dont `key_fn(*args, **kwargs)` est égal.
+
+    La clé est préfixée par le nom de la fonction; `key_fn` ne doit inclure
+    que les arguments qui influencent le résultat.
+    """
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        operation = f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return _group.do((operation, key_fn(*args, **kwargs)), lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
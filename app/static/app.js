@@ -20,6 +20,7 @@ const completedFilter = document.getElementById("completedFilter");
 const gameSort = document.getElementById("gameSort");
 const collectionCount = document.getElementById("collectionCount");
 const gamesGrid = document.getElementById("gamesGrid");
+const loadMoreGamesBtn = document.getElementById("loadMoreGamesBtn");
 const toggleAddGameBtn = document.getElementById("toggleAddGameBtn");
 const addGameModal = document.getElementById("addGameModal");
 const closeAddGameBtn = document.getElementById("closeAddGameBtn");
@@ -74,8 +75,15 @@ const cancelEditBtn = document.getElementById("cancelEditBtn");
 
 let toastTimer;
 let selectedPlatform = "";
+// Pages déjà chargées de la vue courante (plateforme ou toutes), dans l'ordre du tri serveur.
 let gamesForPlatform = [];
-let allGames = [];
+let gamesNextCursor = null;
+// Ignore la réponse d'un chargement de vue dépassé par un plus récent.
+let gamesViewRequest = 0;
+// Agrégat de /api/collection/summary et plateformes en base regroupées par nom canonique.
+let collectionSummary = { total: 0, completed: 0, platforms: [] };
+let platformGroups = new Map();
+let librarySearchRequest = 0;
 let editingGameId = null;
 let currentSheetGameId = null;
 let librarySearchTimer;
@@ -83,6 +91,31 @@ const ALL_PLATFORMS_VIEW = "__all_platforms__";
 const sheetPayloadCache = new Map();
 const SHEET_SEARCH_HISTORY_KEY = "librarySearchHistory";
 const prefetchingSheetIds = new Set();
+const queuedSheetIds = new Set();
+const SHEET_PREFETCH_DELAY_MS = 150;
+const SHEET_WAIT_MAX_ATTEMPTS = 10;
+const SHEET_WAIT_RETRY_DELAY_MS = 1000;
+const SHEET_PREFETCH_BATCH_SIZE = 100;
+let sheetPrefetchTimer;
+// Pages chargées à la demande (bouton « Afficher plus »), jamais toute la collection.
+const GAMES_PAGE_SIZE = 100;
+// Candidats demandés au serveur, reclassés ici (exact, préfixe, contenu) puis tronqués.
+const LIBRARY_SEARCH_FETCH_LIMIT = 50;
+const LIBRARY_SEARCH_MAX_RESULTS = 12;
+// Champs utiles à la grille: description/genre sont chargés à l'édition.
+const GAMES_LIST_FIELDS = "title,platform,completed,ownership_type,cover_url,release_date";
+const COLLECTION_RELOAD_DELAY_MS = 500;
+const EVENT_STREAM_RETRY_MS = 30000;
+let collectionVersion = null;
+// Repli sans flux SSE (plafond atteint): sondage de la version de la collection.
+const COLLECTION_POLL_INTERVAL_MS = 15000;
+let collectionPollTimer = null;
+// Écritures de cet onglet depuis la dernière version connue (chacune l'incrémente).
+let ownWritesSinceVersion = 0;
+// Identifie cet onglet dans les événements `collection` qu'il provoque.
+const CLIENT_ID = window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+let collectionReloadTimer;
+let eventStreamRetryTimer;
 
 const BUILTIN_PLATFORMS = {
   "3DO": "/static/platforms/photos/3do.jpg",
@@ -243,8 +276,8 @@ function showView(name) {
 
 async function api(path, options = {}) {
   const response = await fetch(path, {
-    headers: { "Content-Type": "application/json", ...(options.headers || {}) },
     ...options,
+    headers: { "Content-Type": "application/json", "X-Client-Id": CLIENT_ID, ...(options.headers || {}) },
   });
 
   if (!response.ok) {
@@ -259,6 +292,7 @@ async function api(path, options = {}) {
     throw new Error(message);
   }
 
+  if (options.method && options.method !== "GET") ownWritesSinceVersion += 1;
   if (response.status === 204) return null;
   return response.json();
 }
@@ -313,34 +347,52 @@ function renderSearchHistory() {
     .join("");
 }
 
-function applyGameSort(games) {
-  const data = [...games];
-  const mode = gameSort?.value || "az";
-  if (mode === "za") {
-    data.sort((a, b) => b.title.localeCompare(a.title));
-    return data;
-  }
-  if (mode === "newest") {
-    data.sort((a, b) => (b.release_date || "").localeCompare(a.release_date || ""));
-    return data;
-  }
-  if (mode === "completed") {
-    data.sort((a, b) => Number(Boolean(b.completed)) - Number(Boolean(a.completed)) || a.title.localeCompare(b.title));
-    return data;
-  }
-  data.sort((a, b) => a.title.localeCompare(b.title));
-  return data;
-}
-
 async function fetchSheetPayload(gameId, forceRefresh = false) {
   if (!forceRefresh && sheetPayloadCache.has(String(gameId))) {
     return sheetPayloadCache.get(String(gameId));
   }
   const payload = await api(`/api/games/${gameId}/sheet`);
-  sheetPayloadCache.set(String(gameId), payload);
+  if (!payload.pending) sheetPayloadCache.set(String(gameId), payload);
+  return payload;
+}
+
+async function waitForSheetPayload(gameId) {
+  // Attentes courtes répétées: le serveur répond dès que la fiche enrichie est
+  // en base, quel que soit le worker qui l'a construite.
+  let payload;
+  for (let attempt = 0; attempt < SHEET_WAIT_MAX_ATTEMPTS; attempt += 1) {
+    if (attempt) await new Promise((resolve) => setTimeout(resolve, SHEET_WAIT_RETRY_DELAY_MS));
+    payload = await api(`/api/games/${gameId}/sheet/wait`);
+    if (!payload.pending) {
+      sheetPayloadCache.set(String(gameId), payload);
+      return payload;
+    }
+    if (String(currentSheetGameId) !== String(gameId)) break;
+  }
+  // Toujours en construction (ou introuvable sur IGDB): fiche de repli, non mémorisée.
   return payload;
 }
 
+async function flushSheetPrefetch() {
+  // Un seul appel groupé pour toutes les cartes survolées pendant le délai.
+  const ids = [...queuedSheetIds].slice(0, SHEET_PREFETCH_BATCH_SIZE);
+  ids.forEach((id) => queuedSheetIds.delete(id));
+  if (queuedSheetIds.size) {
+    sheetPrefetchTimer = setTimeout(flushSheetPrefetch, SHEET_PREFETCH_DELAY_MS);
+  }
+  if (!ids.length) return;
+
+  try {
+    const params = new URLSearchParams({ ids: ids.join(",") });
+    const batch = await api(`/api/games/sheets?${params.toString()}`);
+    Object.entries(batch.sheets || {}).forEach(([id, payload]) => sheetPayloadCache.set(String(id), payload));
+  } catch {
+    // Préchargement opportuniste: la fiche sera chargée à l'ouverture.
+  } finally {
+    ids.forEach((id) => prefetchingSheetIds.delete(id));
+  }
+}
+
 function setStatus(message = "") {
   statusMessage.textContent = message;
 }
@@ -369,9 +421,8 @@ function ownershipClass(type) {
   return "unknown";
 }
 
-function computeGlobalStats(games) {
-  const total = games.length;
-  const completed = games.filter((g) => g.completed).length;
+function computeGlobalStats(summary) {
+  const { total, completed } = summary;
   statTotal.textContent = `${total} jeux`;
   statCompleted.textContent = `${completed} terminés`;
   statRemaining.textContent = `${total - completed} à finir`;
@@ -412,7 +463,7 @@ function platformTileBackground(platformName, firstCoverUrl) {
 }
 
 function renderPlatforms() {
-  const fromDb = allGames.map((g) => g.platform).filter(Boolean);
+  const fromDb = [...platformGroups.keys()];
   const custom = getStoredCustomPlatforms();
   const builtin = Object.keys(BUILTIN_PLATFORMS);
 
@@ -434,15 +485,15 @@ function renderPlatforms() {
 
   platformGrid.innerHTML = platforms
     .map((platform) => {
-      const games = allGames.filter((g) => canonicalPlatformName(g.platform) === platform);
-      const cover = builtinPlatformImage(platform) || games.find((g) => g.cover_url)?.cover_url;
+      const group = platformGroups.get(platform);
+      const cover = builtinPlatformImage(platform) || group?.cover_url;
       return `
         <article class="platform-tile" data-platform="${escapeHtml(platform)}">
           <div class="platform-bg" style="${platformTileBackground(platform, cover)}"></div>
           <div class="platform-overlay"></div>
           <div class="platform-content">
             <div class="platform-title">${escapeHtml(platform)}</div>
-            <div class="platform-count">${games.length} jeu(x)</div>
+            <div class="platform-count">${group?.count || 0} jeu(x)</div>
           </div>
         </article>
       `;
@@ -450,26 +501,51 @@ function renderPlatforms() {
     .join("");
 }
 
-async function loadAllGames() {
-  allGames = await api("/api/games");
-  computeGlobalStats(allGames);
+async function loadCollectionSummary() {
+  // Accueil et compteurs: un agrégat par plateforme, pas la collection.
+  collectionSummary = await api("/api/collection/summary");
+  platformGroups = new Map();
+  collectionSummary.platforms.forEach((entry) => {
+    const canonical = canonicalPlatformName(entry.platform);
+    if (!canonical) return;
+    const group = platformGroups.get(canonical) || { names: [], count: 0, completed: 0, cover_url: null };
+    group.names.push(entry.platform);
+    group.count += entry.count;
+    group.completed += entry.completed;
+    group.cover_url = group.cover_url || entry.cover_url;
+    platformGroups.set(canonical, group);
+  });
+  computeGlobalStats(collectionSummary);
   renderPlatforms();
   if (librarySearchInput?.value?.trim()) {
     renderLibrarySearchResults();
   }
 }
 
-function renderLibrarySearchResults() {
+async function renderLibrarySearchResults() {
   const q = (librarySearchInput?.value || "").trim();
   if (!librarySearchResults) return;
 
+  const request = ++librarySearchRequest;
   if (!q) {
     librarySearchResults.innerHTML = "";
     return;
   }
 
+  let candidates;
+  try {
+    const params = new URLSearchParams({ q, limit: String(LIBRARY_SEARCH_FETCH_LIMIT), fields: "title,platform,cover_url" });
+    candidates = (await api(`/api/games?${params.toString()}`)).items;
+  } catch (err) {
+    if (request === librarySearchRequest) {
+      librarySearchResults.innerHTML = `<p>Erreur de recherche: ${escapeHtml(err.message)}.</p>`;
+    }
+    return;
+  }
+  if (request !== librarySearchRequest) return;
+
   const nq = normalizeText(q);
-  const sortedMatches = allGames
+  const sortedMatches = candidates
     .map((g) => {
       const nt = normalizeText(g.title || "");
       let score = 0;
@@ -480,7 +556,7 @@ function renderLibrarySearchResults() {
     })
     .filter((entry) => entry.score > 0)
     .sort((a, b) => b.score - a.score || a.game.title.localeCompare(b.game.title))
-    .slice(0, 12)
+    .slice(0, LIBRARY_SEARCH_MAX_RESULTS)
     .map((entry) => entry.game);
 
   if (!sortedMatches.length) {
@@ -516,8 +592,10 @@ function renderLibrarySearchResults() {
 }
 
 async function openGameFromLibrary(gameId) {
-  const game = allGames.find((g) => String(g.id) === String(gameId));
-  if (!game) {
+  let game;
+  try {
+    game = await api(`/api/games/${gameId}`);
+  } catch {
     showToast("Jeu introuvable.");
     return;
   }
@@ -525,8 +603,8 @@ async function openGameFromLibrary(gameId) {
   selectedPlatform = canonicalPlatformName(game.platform) || game.platform;
   showView("games");
   closeAddGameModal();
-  await loadPlatformGames();
-  await openGameSheet(game.id);
+  await loadPlatformGames().catch(() => null);
+  await openGameSheet(game.id, game);
 }
 
 function renderGameCards(games) {
@@ -558,27 +636,82 @@ function renderGameCards(games) {
     .join("");
 }
 
-async function loadPlatformGames() {
-  if (!selectedPlatform) return;
-  const isAllPlatformsView = selectedPlatform === ALL_PLATFORMS_VIEW;
-  const canonicalSelected = canonicalPlatformName(selectedPlatform);
-  let data = isAllPlatformsView
-    ? [...allGames]
-    : allGames.filter((g) => canonicalPlatformName(g.platform) === canonicalSelected);
-
-  if (completedFilter.value === "true") {
-    data = data.filter((g) => g.completed);
-  } else if (completedFilter.value === "false") {
-    data = data.filter((g) => !g.completed);
+function platformGamesParams(limit) {
+  const params = new URLSearchParams({ limit: String(limit), fields: GAMES_LIST_FIELDS, sort: gameSort?.value || "az" });
+  if (selectedPlatform !== ALL_PLATFORMS_VIEW) {
+    // Toutes les valeurs en base regroupées sous ce nom (alias d'une même console).
+    const names = platformGroups.get(canonicalPlatformName(selectedPlatform))?.names || [selectedPlatform];
+    names.forEach((name) => params.append("platform", name));
+  }
+  if (completedFilter.value === "true" || completedFilter.value === "false") {
+    params.set("completed", completedFilter.value);
   }
-  gamesForPlatform = applyGameSort(data);
+  return params;
+}
+
+function viewGameCount() {
+  const isAllPlatformsView = selectedPlatform === ALL_PLATFORMS_VIEW;
+  const group = isAllPlatformsView ? null : platformGroups.get(canonicalPlatformName(selectedPlatform));
+  const total = isAllPlatformsView ? collectionSummary.total : group?.count || 0;
+  const completed = isAllPlatformsView ? collectionSummary.completed : group?.completed || 0;
+  if (completedFilter.value === "true") return completed;
+  if (completedFilter.value === "false") return total - completed;
+  return total;
+}
 
+function renderPlatformGames() {
+  const isAllPlatformsView = selectedPlatform === ALL_PLATFORMS_VIEW;
+  const count = viewGameCount();
   platformTitle.textContent = isAllPlatformsView ? "Toutes les plateformes" : selectedPlatform;
   platformSubtitle.textContent = isAllPlatformsView
-    ? `${gamesForPlatform.length} jeu(x) dans toutes les plateformes`
-    : `${gamesForPlatform.length} jeu(x) dans cette vue`;
+    ? `${count} jeu(x) dans toutes les plateformes`
+    : `${count} jeu(x) dans cette vue`;
   collectionCount.textContent = `${gamesForPlatform.length} affiché(s)`;
   renderGameCards(gamesForPlatform);
+  loadMoreGamesBtn.classList.toggle("hidden", !gamesNextCursor);
+}
+
+async function loadPlatformGames({ keepLoaded = false } = {}) {
+  if (!selectedPlatform) return;
+  const request = ++gamesViewRequest;
+  // Après une écriture, ce qui était affiché est rechargé en une requête
+  // (bornée par le serveur); sinon, première page seulement.
+  const limit = keepLoaded ? Math.max(gamesForPlatform.length, GAMES_PAGE_SIZE) : GAMES_PAGE_SIZE;
+  if (!keepLoaded) {
+    gamesForPlatform = [];
+    gamesNextCursor = null;
+    gamesGrid.innerHTML = '<p class="meta">Chargement...</p>';
+  }
+  const page = await api(`/api/games?${platformGamesParams(limit).toString()}`);
+  if (request !== gamesViewRequest) return;
+  gamesForPlatform = page.items;
+  gamesNextCursor = page.next_cursor || null;
+  renderPlatformGames();
+}
+
+async function loadMorePlatformGames() {
+  if (!gamesNextCursor) return;
+  const request = gamesViewRequest;
+  const params = platformGamesParams(GAMES_PAGE_SIZE);
+  params.set("after", gamesNextCursor);
+  setBusy(loadMoreGamesBtn, "Chargement...", "Afficher plus", true);
+  try {
+    const page = await api(`/api/games?${params.toString()}`);
+    if (request !== gamesViewRequest) return;
+    gamesForPlatform = [...gamesForPlatform, ...page.items];
+    gamesNextCursor = page.next_cursor || null;
+    renderPlatformGames();
+  } catch (err) {
+    showToast(`Erreur: ${err.message}`);
+  } finally {
+    setBusy(loadMoreGamesBtn, "Chargement...", "Afficher plus", false);
+  }
+}
+
+function reloadPlatformGames() {
+  loadPlatformGames().catch((err) => {
+    gamesGrid.innerHTML = `<p>Erreur de chargement: ${escapeHtml(err.message)}.</p>`;
+  });
 }
 
 function goToPlatform(platform) {
@@ -586,7 +719,7 @@ function goToPlatform(platform) {
   showView("games");
   closeAddGameModal();
   setStatus(`Plateforme active: ${platform}`);
-  loadPlatformGames();
+  reloadPlatformGames();
 }
 
 function openGlobalGamesView(statFilter = "") {
@@ -595,7 +728,7 @@ function openGlobalGamesView(statFilter = "") {
   showView("games");
   closeAddGameModal();
   setStatus("Vue globale des jeux.");
-  loadPlatformGames();
+  reloadPlatformGames();
 }
 
 function fillFormFromMetadata(item) {
@@ -615,7 +748,13 @@ async function loadSearchResults() {
 
   try {
     const params = new URLSearchParams({ query: q });
-    const results = await api(`/api/metadata/search?${params.toString()}`);
+    // Titres possédés proches de la saisie, pour le badge « Déjà possédé ».
+    const ownedParams = new URLSearchParams({ q, limit: String(LIBRARY_SEARCH_FETCH_LIMIT), fields: "title" });
+    const [results, owned] = await Promise.all([
+      api(`/api/metadata/search?${params.toString()}`),
+      api(`/api/games?${ownedParams.toString()}`).catch(() => ({ items: [] })),
+    ]);
+    const ownedTitles = new Set(owned.items.map((g) => normalizeText(g.title || "")));
     if (!results.length) {
       searchResults.innerHTML = "<p>Aucun résultat.</p>";
       return;
@@ -635,7 +774,7 @@ async function loadSearchResults() {
                 <strong>${escapeHtml(r.title || "Sans titre")}</strong>
                 <p class="meta">${escapeHtml((r.platforms || []).join(", ") || "N/A")}</p>
                 ${
-                  allGames.some((g) => normalizeText(g.title || "") === normalizeText(r.title || ""))
+                  ownedTitles.has(normalizeText(r.title || ""))
                     ? '<span class="badge done">Déjà possédé</span>'
                     : ""
                 }
@@ -653,8 +792,53 @@ async function loadSearchResults() {
   }
 }
 
-async function openGameSheet(gameId) {
-  const game = gamesForPlatform.find((g) => String(g.id) === String(gameId));
+function renderSheet(sheet, game) {
+  sheetTitle.textContent = sheet.title || game.title;
+  sheetMetaLine.textContent = `${sheet.platform || game.platform} • ${sheet.release_year || "Année inconnue"} • ${sheet.publisher || "Éditeur inconnu"}`;
+
+  sheetStatus.className = `sheet-status ${sheet.completed ? "done" : "todo"}`;
+  sheetStatus.textContent = sheet.completed ? "Statut: Terminé" : "Statut: Non terminé";
+  const ownType = sheet.ownership_type || game.ownership_type;
+  sheetOwnership.className = `badge ownership-badge ${ownershipClass(ownType)}`;
+  sheetOwnership.textContent = `Format: ${ownershipLabel(ownType)}`;
+
+  if (sheet.cover_url) {
+    sheetCover.src = sheet.cover_url;
+    sheetCover.alt = `cover ${sheet.title || game.title}`;
+  } else {
+    sheetCover.removeAttribute("src");
+    sheetCover.alt = "Aucune image";
+  }
+
+  sheetDescriptionFr.textContent = sheet.description_fr || "Description française non disponible pour ce jeu.";
+  sheetDescriptionEn.textContent = sheet.description || "English description not available for this game.";
+
+  const images = sheet.images || [];
+  sheetImages.innerHTML = images.length
+    ? images.map((url) => `<img src="${escapeHtml(url)}" alt="image ${escapeHtml(sheet.title || game.title)}" loading="lazy" />`).join("")
+    : "<p class='meta'>Aucune image disponible.</p>";
+
+  const videos = sheet.videos || [];
+  sheetVideos.innerHTML = videos.length
+    ? videos
+        .map(
+          (v) => `
+            <div>
+              <iframe src="${escapeHtml(v.embed_url)}" title="${escapeHtml(v.name || "Vidéo")}" loading="lazy" allowfullscreen></iframe>
+              <p class="meta">${escapeHtml(v.name || "Vidéo")}</p>
+            </div>
+          `,
+        )
+        .join("")
+    : "<p class='meta'>Aucune vidéo disponible.</p>";
+}
+
+async function openGameSheet(gameId, knownGame = null) {
+  // Le jeu peut être hors des pages chargées (recherche, fiche rouverte après édition).
+  const game =
+    knownGame ||
+    gamesForPlatform.find((g) => String(g.id) === String(gameId)) ||
+    (await api(`/api/games/${gameId}`).catch(() => null));
   if (!game) return;
 
   showView("sheet");
@@ -669,45 +853,13 @@ async function openGameSheet(gameId) {
   sheetVideos.innerHTML = "";
 
   try {
-    const sheet = await fetchSheetPayload(game.id);
-    sheetTitle.textContent = sheet.title || game.title;
-    sheetMetaLine.textContent = `${sheet.platform || game.platform} • ${sheet.release_year || "Année inconnue"} • ${sheet.publisher || "Éditeur inconnu"}`;
-
-    sheetStatus.className = `sheet-status ${sheet.completed ? "done" : "todo"}`;
-    sheetStatus.textContent = sheet.completed ? "Statut: Terminé" : "Statut: Non terminé";
-    const ownType = sheet.ownership_type || game.ownership_type;
-    sheetOwnership.className = `badge ownership-badge ${ownershipClass(ownType)}`;
-    sheetOwnership.textContent = `Format: ${ownershipLabel(ownType)}`;
-
-    if (sheet.cover_url) {
-      sheetCover.src = sheet.cover_url;
-      sheetCover.alt = `cover ${sheet.title || game.title}`;
-    } else {
-      sheetCover.removeAttribute("src");
-      sheetCover.alt = "Aucune image";
+    let sheet = await fetchSheetPayload(game.id);
+    renderSheet(sheet, game);
+    if (sheet.pending) {
+      viewGameSheet.classList.remove("is-loading");
+      sheet = await waitForSheetPayload(game.id).catch(() => sheet);
+      if (String(currentSheetGameId) === String(game.id)) renderSheet(sheet, game);
     }
-
-    sheetDescriptionFr.textContent = sheet.description_fr || "Description française non disponible pour ce jeu.";
-    sheetDescriptionEn.textContent = sheet.description || "English description not available for this game.";
-
-    const images = sheet.images || [];
-    sheetImages.innerHTML = images.length
-      ? images.map((url) => `<img src="${escapeHtml(url)}" alt="image ${escapeHtml(sheet.title || game.title)}" loading="lazy" />`).join("")
-      : "<p class='meta'>Aucune image disponible.</p>";
-
-    const videos = sheet.videos || [];
-    sheetVideos.innerHTML = videos.length
-      ? videos
-          .map(
-            (v) => `
-              <div>
-                <iframe src="${escapeHtml(v.embed_url)}" title="${escapeHtml(v.name || "Vidéo")}" loading="lazy" allowfullscreen></iframe>
-                <p class="meta">${escapeHtml(v.name || "Vidéo")}</p>
-              </div>
-            `,
-          )
-          .join("")
-      : "<p class='meta'>Aucune vidéo disponible.</p>";
   } catch (err) {
     sheetMetaLine.textContent = `Erreur: ${err.message}`;
     sheetOwnership.className = `badge ownership-badge ${ownershipClass(game.ownership_type)}`;
@@ -719,9 +871,14 @@ async function openGameSheet(gameId) {
   }
 }
 
-function openEditModal(gameId) {
-  const game = gamesForPlatform.find((g) => String(g.id) === String(gameId)) || allGames.find((g) => String(g.id) === String(gameId));
-  if (!game) return;
+async function openEditModal(gameId) {
+  let game;
+  try {
+    game = await api(`/api/games/${gameId}`);
+  } catch (err) {
+    showToast(`Erreur: ${err.message}`);
+    return;
+  }
 
   editingGameId = game.id;
   editTitleInput.value = game.title || "";
@@ -785,7 +942,7 @@ addPlatformBtn.addEventListener("click", () => {
 backToPlatformsBtn.addEventListener("click", () => {
   closeAddGameModal();
   showView("platforms");
-  loadAllGames();
+  loadCollectionSummary().catch((err) => setStatus(`Erreur: ${err.message}`));
 });
 
 topbarStats.addEventListener("click", (event) => {
@@ -810,8 +967,9 @@ backToGamesBtn.addEventListener("click", () => {
   showView("games");
 });
 
-completedFilter.addEventListener("change", loadPlatformGames);
-gameSort.addEventListener("change", loadPlatformGames);
+completedFilter.addEventListener("change", reloadPlatformGames);
+gameSort.addEventListener("change", reloadPlatformGames);
+loadMoreGamesBtn.addEventListener("click", loadMorePlatformGames);
 
 searchBtn.addEventListener("click", loadSearchResults);
 searchInput.addEventListener("keydown", (event) => {
@@ -857,8 +1015,8 @@ searchResults.addEventListener("click", async (event) => {
       body: JSON.stringify(payload),
     });
     sheetPayloadCache.clear();
-    await loadAllGames();
-    await loadPlatformGames();
+    await loadCollectionSummary();
+    await loadPlatformGames({ keepLoaded: true });
     showToast("Jeu ajouté depuis IGDB.");
   } catch (err) {
     showToast(`Erreur: ${err.message}`);
@@ -970,8 +1128,8 @@ gameForm.addEventListener("submit", async (event) => {
     gameForm.reset();
     closeAddGameModal();
     sheetPayloadCache.clear();
-    await loadAllGames();
-    await loadPlatformGames();
+    await loadCollectionSummary();
+    await loadPlatformGames({ keepLoaded: true });
     showToast("Jeu ajouté.");
   } catch (err) {
     showToast(`Erreur: ${err.message}`);
@@ -999,9 +1157,9 @@ gamesGrid.addEventListener("mouseover", (event) => {
   const gameId = card.dataset.gameId;
   if (!gameId || sheetPayloadCache.has(String(gameId)) || prefetchingSheetIds.has(String(gameId))) return;
   prefetchingSheetIds.add(String(gameId));
-  fetchSheetPayload(gameId)
-    .catch(() => null)
-    .finally(() => prefetchingSheetIds.delete(String(gameId)));
+  queuedSheetIds.add(String(gameId));
+  clearTimeout(sheetPrefetchTimer);
+  sheetPrefetchTimer = setTimeout(flushSheetPrefetch, SHEET_PREFETCH_DELAY_MS);
 });
 
 sheetEditBtn.addEventListener("click", () => {
@@ -1049,8 +1207,8 @@ editGameForm.addEventListener("submit", async (event) => {
     });
     sheetPayloadCache.delete(String(editingGameId));
     closeEditModal();
-    await loadAllGames();
-    await loadPlatformGames();
+    await loadCollectionSummary();
+    await loadPlatformGames({ keepLoaded: true });
     if (currentSheetGameId && String(currentSheetGameId) === String(editingGameId)) {
       await fetchSheetPayload(currentSheetGameId, true).catch(() => null);
       await openGameSheet(currentSheetGameId);
@@ -1063,13 +1221,90 @@ editGameForm.addEventListener("submit", async (event) => {
   }
 });
 
+function scheduleCollectionReload() {
+  clearTimeout(collectionReloadTimer);
+  collectionReloadTimer = setTimeout(async () => {
+    try {
+      // Toute écriture change la version de la collection, donc l'ETag de
+      // chaque page: l'agrégat et les pages affichées sont rechargés.
+      await loadCollectionSummary();
+      await loadPlatformGames({ keepLoaded: true });
+    } catch {
+      // Rechargement opportuniste: la prochaine action de l'utilisateur réessaiera.
+    }
+  }, COLLECTION_RELOAD_DELAY_MS);
+}
+
+async function pollCollectionVersion() {
+  try {
+    const { version } = await api("/api/collection/version");
+    // Un écart entièrement dû aux écritures de cet onglet est déjà rechargé.
+    if (collectionVersion !== null && version - collectionVersion !== ownWritesSinceVersion) {
+      sheetPayloadCache.clear();
+      scheduleCollectionReload();
+    }
+    collectionVersion = version;
+    ownWritesSinceVersion = 0;
+  } catch {
+    // Sondage opportuniste: le prochain tour réessaiera.
+  }
+}
+
+function startCollectionPolling() {
+  if (collectionPollTimer) return;
+  collectionPollTimer = setInterval(pollCollectionVersion, COLLECTION_POLL_INTERVAL_MS);
+  pollCollectionVersion();
+}
+
+function stopCollectionPolling() {
+  clearInterval(collectionPollTimer);
+  collectionPollTimer = null;
+}
+
+function connectEventStream() {
+  if (!window.EventSource) {
+    startCollectionPolling();
+    return;
+  }
+  const source = new EventSource("/api/events");
+
+  source.addEventListener("hello", (event) => {
+    stopCollectionPolling();
+    const { version } = JSON.parse(event.data);
+    // Version différente à la reconnexion: des événements ont pu être manqués.
+    if (collectionVersion !== null && version !== collectionVersion) {
+      sheetPayloadCache.clear();
+      scheduleCollectionReload();
+    }
+    collectionVersion = version;
+    ownWritesSinceVersion = 0;
+  });
+  source.addEventListener("sheets", (event) => {
+    (JSON.parse(event.data).ids || []).forEach((id) => sheetPayloadCache.delete(String(id)));
+  });
+  source.addEventListener("collection", (event) => {
+    // L'onglet auteur de l'écriture a déjà rechargé dans son propre gestionnaire.
+    if (JSON.parse(event.data).origin === CLIENT_ID) return;
+    scheduleCollectionReload();
+  });
+  source.addEventListener("resync", () => sheetPayloadCache.clear());
+  source.onerror = () => {
+    // Refus (503) ou erreur définitive: EventSource ne se reconnecte pas seul.
+    if (source.readyState !== EventSource.CLOSED) return;
+    startCollectionPolling();
+    clearTimeout(eventStreamRetryTimer);
+    eventStreamRetryTimer = setTimeout(connectEventStream, EVENT_STREAM_RETRY_MS);
+  };
+}
+
 (async function init() {
   try {
     setStatus("Chargement...");
     renderSearchHistory();
-    await loadAllGames();
+    await loadCollectionSummary();
     showView("platforms");
     setStatus("Choisis une plateforme pour continuer.");
+    connectEventStream();
   } catch (err) {
     setStatus(`Erreur: ${err.message}`);
   }
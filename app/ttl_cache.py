@@ -0,0 +1,124 @@
+"""Cache mémoire borné (LRU + TTL) pour les métadonnées externes.
+
+Remplace les dictionnaires de module qui grossissaient sans limite: le nombre
+d'entrées et la taille approximative sont plafonnés, chaque entrée expire, et
+les résultats négatifs (None, liste vide) expirent plus vite pour ne pas
+figer une erreur passagère.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 64
+
+
+class TTLCache:
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_bytes: int | None = None,
+        is_negative: Callable[[Any], bool] = lambda value: not value,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._is_negative = is_negative
+        self._lock = threading.Lock()
+        # clé -> (valeur, expiration monotonic, taille)
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """Comme `get`, mais distingue une valeur None en cache d'une absence."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return False, None
+        return True, value
+
+    def ttl_for(self, value: Any) -> float:
+        return self.negative_ttl_seconds if self._is_negative(value) else self.ttl_seconds
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_for(value)
+        size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + ttl_seconds, size)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                oldest_key = next(iter(self._entries))
+                self._drop(oldest_key)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
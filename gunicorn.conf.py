@@ -0,0 +1,9 @@
+# Chargé par gunicorn depuis le répertoire courant (voir Dockerfile).
+
+
+def post_worker_init(worker):
+    # Chaque worker vérifie le schéma et démarre ses propres threads
+    # (écoute des invalidations, rafraîchissement des fiches).
+    from app import start_serving
+
+    start_serving(worker.wsgi)